@@ -2,22 +2,37 @@
 # Module validation script for ControllerLaunch
 
 import os
+import ast
 import sys
+import pickle
+import tempfile
+import functools
 import importlib
 import importlib.util
 from pathlib import Path
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import logging
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 logger = logging.getLogger("validator")
 
-def add_src_to_path():
-    """Add the src directory to the Python path."""
+# Cache of parsed imports, keyed by file path and invalidated by mtime/size
+IMPORT_CACHE_PATH = os.path.expanduser("~/.cache/controller-launch/validate/imports.pickle")
+IMPORT_CACHE_VERSION = 2
+
+@functools.lru_cache(maxsize=1)
+def get_src_dir():
+    """Return the project's src directory."""
     # Find project root
     current_dir = Path(__file__).resolve().parent
     project_root = current_dir.parent
-    src_dir = project_root / "src"
+    return project_root / "src"
+
+def add_src_to_path():
+    """Add the src directory to the Python path."""
+    src_dir = get_src_dir()
     
     if src_dir.exists():
         sys.path.insert(0, str(src_dir))
@@ -46,8 +61,15 @@ def check_module(module_name, imported_by=None):
         logger.error(f"Unexpected error: {e}")
         return False, None
 
-def check_core_modules():
-    """Check all core modules for import errors."""
+def check_core_modules(parallel=False):
+    """Check all core modules for import errors.
+    
+    Args:
+        parallel: Import the modules concurrently. Only safe when the
+            import graph has no cycles, and concurrent first imports of
+            GTK and pygame can give nondeterministic results, so the
+            default is to import them one at a time.
+    """
     core_modules = [
         "main",
         "config_manager",
@@ -57,91 +79,218 @@ def check_core_modules():
         "preferences_ui"
     ]
     
+    if parallel:
+        # Import the modules concurrently so native library loading (SDL, GTK)
+        # overlaps
+        with ThreadPoolExecutor(max_workers=len(core_modules)) as executor:
+            results = list(executor.map(check_module, core_modules))
+    else:
+        results = [check_module(module_name) for module_name in core_modules]
+        
     success = True
-    for module_name in core_modules:
-        module_success, _ = check_module(module_name)
+    for module_success, _ in results:
         if not module_success:
             success = False
             
     return success
 
+def load_import_cache():
+    """Load the cache of parsed imports, keyed by file path."""
+    try:
+        with open(IMPORT_CACHE_PATH, 'rb') as f:
+            cache = pickle.load(f)
+        if isinstance(cache, dict) and cache.get('version') == IMPORT_CACHE_VERSION:
+            return cache['files']
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable import cache: {e}")
+    return {}
+
+def save_import_cache(cache):
+    """Atomically write the cache of parsed imports."""
+    cache_dir = os.path.dirname(IMPORT_CACHE_PATH)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(
+                    {'version': IMPORT_CACHE_VERSION, 'files': cache},
+                    f,
+                    protocol=pickle.HIGHEST_PROTOCOL
+                )
+            os.replace(tmp_path, IMPORT_CACHE_PATH)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+    except Exception as e:
+        logger.warning(f"Could not write import cache: {e}")
+
+def parse_imports(py_file):
+    """Return the list of modules imported at the top level of a Python file.
+    
+    Returns None if the file cannot be parsed.
+    """
+    imports = []
+    
+    try:
+        tree = ast.parse(py_file.read_text(), filename=str(py_file))
+    except (SyntaxError, UnicodeDecodeError, ValueError) as e:
+        logger.error(f"Could not parse {py_file}: {e}")
+        return None
+    
+    # Only module-level imports matter for circular imports at load time,
+    # including those guarded by top-level if/try blocks
+    nodes = deque(tree.body)
+    while nodes:
+        node = nodes.popleft()
+        if isinstance(node, (ast.If, ast.Try)):
+            # Push the nested blocks back onto the front so statements are
+            # still visited in source order
+            nested = list(node.body)
+            if isinstance(node, ast.Try):
+                for handler in node.handlers:
+                    nested.extend(handler.body)
+            nested.extend(node.orelse)
+            if isinstance(node, ast.Try):
+                nested.extend(node.finalbody)
+            nodes.extendleft(reversed(nested))
+        elif isinstance(node, ast.ImportFrom):
+            if node.module and node.module != '__future__':
+                imports.append(node.module)
+        elif isinstance(node, ast.Import):
+            imports.extend(alias.name for alias in node.names if alias.name != '__future__')
+            
+    return imports
+
+def find_cycle(scc, local_edges):
+    """Return a real import cycle through the first module of an SCC.
+
+    Follows local imports within the component with a breadth-first search
+    from scc[0] back to itself, so every arrow in the result is an actual
+    import. The result starts and ends with scc[0].
+    """
+    start = scc[0]
+    members = set(scc)
+    parents = {}
+    queue = [start]
+    for node in queue:
+        for neighbor in local_edges[node]:
+            if neighbor not in members:
+                continue
+            if neighbor == start:
+                # Walk the parent links back to reconstruct the path
+                path = [node]
+                while path[-1] != start:
+                    path.append(parents[path[-1]])
+                path.reverse()
+                return path + [start]
+            if neighbor not in parents:
+                parents[neighbor] = node
+                queue.append(neighbor)
+    # Every node of a non-trivial SCC lies on a cycle, so this is unreachable
+    return scc + [start]
+
 def check_circular_imports():
     """Check for potential circular imports."""
     # Map of modules and their direct imports
     import_graph = {}
     
     # Source directory
-    current_dir = Path(__file__).resolve().parent
-    project_root = current_dir.parent
-    src_dir = project_root / "src"
+    src_dir = get_src_dir()
     
     # Get all Python files in src directory
     python_files = list(src_dir.glob("*.py"))
     logger.info(f"Found {len(python_files)} Python files in {src_dir}")
     
-    # Parse imports from each file
+    # Parse imports from each file, reusing cached results for unchanged files
+    cache = load_import_cache()
     for py_file in python_files:
         module_name = py_file.stem
-        import_graph[module_name] = []
+        cache_key = str(py_file.resolve())
+        st = os.stat(py_file)
         
-        # Simple parsing to find import statements
-        with open(py_file, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line.startswith('from ') and ' import ' in line:
-                    # Extract module name (handling relative imports)
-                    parts = line.split(' import ')[0].split('from ')[1].strip()
-                    if parts.startswith('.'):
-                        parts = parts[1:]
-                    if parts and parts != '__future__':
-                        import_graph[module_name].append(parts)
-                elif line.startswith('import '):
-                    # Extract module name
-                    parts = line[7:].strip().split(' as ')[0].split(',')
-                    for p in parts:
-                        p = p.strip()
-                        if p and p != '__future__':
-                            import_graph[module_name].append(p)
+        cached = cache.get(cache_key)
+        if cached and cached[:2] == (st.st_mtime_ns, st.st_size):
+            import_graph[module_name] = cached[2]
+            continue
+            
+        imports = parse_imports(py_file)
+        if imports is None:
+            # Don't cache failed parses so the error is reported on every run
+            import_graph[module_name] = []
+            cache.pop(cache_key, None)
+            continue
+        import_graph[module_name] = imports
+        cache[cache_key] = (st.st_mtime_ns, st.st_size, imports)
+    save_import_cache(cache)
     
-    # Check for circular imports
-    def find_cycles(node, visited, path):
-        """Use DFS to find cycles in the import graph."""
-        visited.add(node)
-        path.append(node)
+    # Only imports of other local modules can take part in a cycle, so drop
+    # everything else (stdlib, third-party) up front
+    local_edges = {
+        module: [name for name in imports if name in import_graph]
+        for module, imports in import_graph.items()
+    }
+    
+    # Check for circular imports using an iterative Tarjan SCC pass
+    index = {}
+    lowlink = {}
+    on_stack = set()
+    scc_stack = []
+    cycles = {}
+    counter = 0
+    
+    for root in local_edges:
+        # Modules without local imports cannot start a cycle
+        if root in index or not local_edges[root]:
+            continue
+            
+        index[root] = lowlink[root] = counter
+        counter += 1
+        scc_stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(local_edges[root]))]
         
-        cycles = []
-        if node in import_graph:
-            for neighbor in import_graph[node]:
-                # Only check local imports
-                if neighbor in import_graph:
-                    if neighbor in path:
-                        # Found a cycle
-                        cycle_start = path.index(neighbor)
-                        cycles.append(path[cycle_start:] + [neighbor])
-                    elif neighbor not in visited:
-                        new_cycles = find_cycles(neighbor, visited.copy(), path.copy())
-                        cycles.extend(new_cycles)
-                        
-        return cycles
-    
-    # Find all cycles in the import graph
-    all_cycles = []
-    for node in import_graph:
-        cycles = find_cycles(node, set(), [])
-        all_cycles.extend(cycles)
-    
-    # Remove duplicates
-    unique_cycles = []
-    for cycle in all_cycles:
-        cycle_str = "->".join(cycle)
-        is_duplicate = False
-        for unique in unique_cycles:
-            unique_str = "->".join(unique)
-            if set(cycle) == set(unique):
-                is_duplicate = True
-                break
-        if not is_duplicate:
-            unique_cycles.append(cycle)
+        while work:
+            node, neighbors = work[-1]
+            advanced = False
+            for neighbor in neighbors:
+                if neighbor not in index:
+                    index[neighbor] = lowlink[neighbor] = counter
+                    counter += 1
+                    scc_stack.append(neighbor)
+                    on_stack.add(neighbor)
+                    work.append((neighbor, iter(local_edges[neighbor])))
+                    advanced = True
+                    break
+                elif neighbor in on_stack:
+                    lowlink[node] = min(lowlink[node], index[neighbor])
+                    
+            if advanced:
+                continue
+                
+            # All neighbors visited, pop the frame
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[node])
+                
+            if lowlink[node] == index[node]:
+                # Node is the root of a strongly connected component
+                scc = []
+                while True:
+                    member = scc_stack.pop()
+                    on_stack.discard(member)
+                    scc.append(member)
+                    if member == node:
+                        break
+                scc.reverse()
+                
+                if len(scc) > 1 or node in local_edges[node]:
+                    cycles.setdefault(frozenset(scc), find_cycle(scc, local_edges))
+    
+    unique_cycles = list(cycles.values())
     
     if unique_cycles:
         logger.error(f"Found {len(unique_cycles)} circular import chains:")
@@ -2,16 +2,85 @@
 # ControllerLaunch - Configuration Manager
 
 import os
+import copy
 import json
+import atexit
+import functools
 import logging
 import sys
+import tempfile
+import threading
+import weakref
+from collections import OrderedDict
 from pathlib import Path
 
 logger = logging.getLogger('controller-launch.config')
 
+# Use orjson for faster parsing when it is available. Writes always go
+# through json, since orjson can only indent by two spaces and the config
+# files are indented by four.
+try:
+    import orjson
+    
+    def _loads(data):
+        return orjson.loads(data)
+except ImportError:
+    def _loads(data):
+        return json.loads(data)
+
+def _dumps(obj):
+    return json.dumps(obj, indent=4).encode('utf-8')
+
+# Version of the configuration layout. Bump this whenever keys are added to
+# the defaults so existing user configs get merged with them once on load.
+SCHEMA_VERSION = 2
+
+@functools.lru_cache(maxsize=1)
+def _user_config_dir():
+    """Get the per-user configuration directory."""
+    return os.path.expanduser("~/.config/controller-launch")
+
+def _compute_default_config_paths():
+    """Get candidate locations of the default configuration file, in order."""
+    # Check if we're running from source or as installed package
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    parent_dir = os.path.dirname(script_dir)
+    
+    return (
+        os.path.join(parent_dir, "config", "default_config.json"),  # Source tree
+        "/etc/controller-launch/default_config.json",  # System-wide installation
+        os.path.join(sys.prefix, "share", "controller-launch", "default_config.json")  # Python installation
+    )
+
+_DEFAULT_CONFIG_PATHS = _compute_default_config_paths()
+
+@functools.lru_cache(maxsize=1)
+def _discover_default_config_path():
+    """Get the path to the default configuration file."""
+    for path in _DEFAULT_CONFIG_PATHS:
+        if os.path.isfile(path):
+            logger.info(f"Found default configuration at {path}")
+            return path
+            
+    # If default config not found, use a minimal fallback
+    logger.warning("Default configuration not found, using minimal defaults")
+    return None
+
+# Managers with possibly pending writes, flushed once at interpreter exit.
+# Held weakly so short-lived managers are not kept alive until then.
+_live_managers = weakref.WeakSet()
+
+@atexit.register
+def _flush_live_managers():
+    for manager in list(_live_managers):
+        manager.flush()
+
 class ConfigManager:
     """Manages application configuration and user preferences."""
     
+    # Delay in seconds used to coalesce bursts of writes into a single save
+    SAVE_DELAY = 0.5
+    
     def __init__(self, config_path=None):
         """Initialize the configuration manager.
         
@@ -19,7 +88,7 @@ class ConfigManager:
             config_path: Optional custom path to config file
         """
         if config_path is None:
-            self.config_path = os.path.expanduser("~/.config/controller-launch/config.json")
+            self.config_path = os.path.join(_user_config_dir(), "config.json")
         else:
             self.config_path = config_path
             
@@ -28,38 +97,50 @@ class ConfigManager:
         
         # Get the default config path
         self.default_config_path = self._get_default_config_path()
+        self._default_config_cache = None
+        self._defaults_loaded = False
+        
+        # Pending write state for debounced saves
+        self._lock = threading.RLock()
+        self._dirty = False
+        self._save_timer = None
+        
+        # Bumped on every change so views can tell when to reload
+        self.revision = 0
         
         # Load or create configuration
         self.config = self.load()
+        self._index_recently_launched()
+        
+        # Make sure pending changes reach disk on exit
+        _live_managers.add(self)
         
     def _get_default_config_path(self):
         """Get the path to the default configuration file."""
-        # Check if we're running from source or as installed package
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        parent_dir = os.path.dirname(script_dir)
-        
-        # Try to find default config in various locations
-        potential_paths = [
-            os.path.join(parent_dir, "config", "default_config.json"),  # Source tree
-            "/etc/controller-launch/default_config.json",  # System-wide installation
-            os.path.join(sys.prefix, "share", "controller-launch", "default_config.json")  # Python installation
-        ]
-        
-        for path in potential_paths:
-            if os.path.exists(path):
-                logger.info(f"Found default configuration at {path}")
-                return path
-                
-        # If default config not found, use a minimal fallback
-        logger.warning("Default configuration not found, using minimal defaults")
-        return None
+        return _discover_default_config_path()
         
     def _get_default_config(self):
-        """Load the default configuration."""
+        """Load the default configuration.
+        
+        The default file is parsed once and cached; callers receive a
+        deep copy so they can safely mutate the result. Only defaults read
+        from the file are stamped with the schema version, so configs built
+        from the minimal fallback are merged again once the file is readable.
+        """
+        if self._default_config_cache is None:
+            self._default_config_cache = self._read_default_config()
+            if self._defaults_loaded:
+                self._default_config_cache["schema_version"] = SCHEMA_VERSION
+        return copy.deepcopy(self._default_config_cache)
+        
+    def _read_default_config(self):
+        """Read the default configuration from disk."""
         try:
             if self.default_config_path and os.path.exists(self.default_config_path):
-                with open(self.default_config_path, 'r') as f:
-                    return json.load(f)
+                with open(self.default_config_path, 'rb') as f:
+                    defaults = _loads(f.read())
+                self._defaults_loaded = True
+                return defaults
         except Exception as e:
             logger.error(f"Error loading default configuration: {str(e)}")
             
@@ -75,12 +156,22 @@ class ConfigManager:
         """Load configuration from file or create default if it doesn't exist."""
         try:
             if os.path.exists(self.config_path):
-                with open(self.config_path, 'r') as f:
-                    config = json.load(f)
+                with open(self.config_path, 'rb') as f:
+                    config = _loads(f.read())
                     logger.info(f"Configuration loaded from {self.config_path}")
                     
-                    # Merge with defaults for any missing keys
-                    return self._merge_with_defaults(config)
+                # Up-to-date configs already contain every default key
+                if config.get("schema_version") == SCHEMA_VERSION:
+                    return config
+                    
+                # Merge with defaults for any missing keys and store the result
+                config = self._merge_with_defaults(config)
+                if self._defaults_loaded:
+                    config["schema_version"] = SCHEMA_VERSION
+                else:
+                    config.pop("schema_version", None)
+                self.save(config)
+                return config
             else:
                 logger.info("No configuration file found, creating default")
                 default_config = self._get_default_config()
@@ -88,7 +179,11 @@ class ConfigManager:
                 return default_config
         except Exception as e:
             logger.error(f"Error loading configuration: {str(e)}")
-            return self._get_default_config()
+            
+            # Not stamped, so the user config is merged again on next load
+            default_config = self._get_default_config()
+            default_config.pop("schema_version", None)
+            return default_config
     
     def _merge_with_defaults(self, config):
         """Merge loaded config with defaults to ensure all keys exist."""
@@ -112,20 +207,88 @@ class ConfigManager:
         return result
     
     def save(self, config=None):
-        """Save current configuration to file."""
-        if config is None:
-            config = self.config
-        else:
-            self.config = config
+        """Save current configuration to file immediately."""
+        with self._lock:
+            if config is None:
+                config = self.config
+            else:
+                self.config = config
+                self._index_recently_launched()
+                self.revision += 1
+                
+            self._cancel_save_timer()
+            self._dirty = False
             
-        try:
-            with open(self.config_path, 'w') as f:
-                json.dump(config, f, indent=4)
+            tmp_path = None
+            try:
+                # Write to a temporary file and rename so a crash never leaves
+                # a truncated config behind
+                config_dir = os.path.dirname(self.config_path)
+                with tempfile.NamedTemporaryFile('wb', dir=config_dir, suffix='.tmp', delete=False) as f:
+                    tmp_path = f.name
+                    f.write(_dumps(self._to_serializable(config)))
+                os.replace(tmp_path, self.config_path)
                 logger.info(f"Configuration saved to {self.config_path}")
-            return True
-        except Exception as e:
-            logger.error(f"Error saving configuration: {str(e)}")
-            return False
+                return True
+            except Exception as e:
+                if tmp_path and os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                logger.error(f"Error saving configuration: {str(e)}")
+                return False
+    
+    def _index_recently_launched(self):
+        """Convert the recently launched list into an OrderedDict keyed by game ID.
+        
+        Keeping the recents indexed lets updates move or drop an entry without
+        rebuilding the whole list. It is turned back into a list on save.
+        """
+        games = self.config.setdefault("games", {})
+        recently = games.get("recently_launched")
+        if isinstance(recently, OrderedDict):
+            return
+            
+        games["recently_launched"] = OrderedDict(
+            (g["id"], g) for g in (recently or []) if isinstance(g, dict) and "id" in g
+        )
+    
+    def _to_serializable(self, config):
+        """Return a copy of the config suitable for writing as JSON."""
+        games = config.get("games")
+        if not isinstance(games, dict) or not isinstance(games.get("recently_launched"), OrderedDict):
+            return config
+            
+        result = dict(config)
+        result["games"] = dict(games)
+        result["games"]["recently_launched"] = list(games["recently_launched"].values())
+        return result
+    
+    def flush(self):
+        """Write pending configuration changes to disk, if any.
+        
+        Returns:
+            True if nothing was pending or the save succeeded
+        """
+        with self._lock:
+            if not self._dirty:
+                self._cancel_save_timer()
+                return True
+            return self.save()
+    
+    def _schedule_save(self):
+        """Mark the configuration dirty and schedule a debounced save."""
+        with self._lock:
+            self.revision += 1
+            self._dirty = True
+            self._cancel_save_timer()
+            self._save_timer = threading.Timer(self.SAVE_DELAY, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+    
+    def _cancel_save_timer(self):
+        """Cancel any pending debounced save."""
+        if self._save_timer is not None:
+            self._save_timer.cancel()
+            self._save_timer = None
     
     def get(self, section, key=None, default=None):
         """Get configuration value by section and key.
@@ -144,7 +307,22 @@ class ConfigManager:
         if key is None:
             return self.config[section]
             
-        return self.config[section].get(key, default)
+        value = self.config[section].get(key, default)
+        if isinstance(value, OrderedDict):
+            return list(value.values())
+        return value
+    
+    def get_all(self):
+        """Get the whole configuration in one call.
+        
+        The section dicts are shared with the manager, so callers must not
+        modify them. Use update() to change values.
+        
+        Returns:
+            Dict mapping section names to dicts of settings
+        """
+        with self._lock:
+            return self._to_serializable(self.config)
     
     def set(self, section, key, value):
         """Set configuration value.
@@ -154,11 +332,27 @@ class ConfigManager:
             key: Key within section
             value: Value to set
         """
-        if section not in self.config:
-            self.config[section] = {}
-            
-        self.config[section][key] = value
-        self.save()
+        with self._lock:
+            if section not in self.config:
+                self.config[section] = {}
+                
+            self.config[section][key] = value
+            if section == "games" and key == "recently_launched":
+                self._index_recently_launched()
+            self._schedule_save()
+    
+    def update(self, updates):
+        """Set several configuration values with a single save.
+        
+        Args:
+            updates: Dict mapping section names to dicts of key/value pairs
+        """
+        with self._lock:
+            for section, values in updates.items():
+                self.config.setdefault(section, {}).update(values)
+            if "recently_launched" in updates.get("games", {}):
+                self._index_recently_launched()
+            self._schedule_save()
     
     def update_recently_launched(self, game_id, game_info):
         """Update the recently launched games list.
@@ -167,29 +361,56 @@ class ConfigManager:
             game_id: Unique game identifier
             game_info: Game information dict
         """
-        if "games" not in self.config:
-            self.config["games"] = {"recently_launched": []}
+        with self._lock:
+            recently = self.config["games"]["recently_launched"]
             
-        if "recently_launched" not in self.config["games"]:
-            self.config["games"]["recently_launched"] = []
+            # Move the game to the front of the list
+            recently.pop(game_id, None)
+            recently[game_id] = {
+                "id": game_id,
+                "name": game_info["name"],
+                "source": game_info["source"],
+                "last_played": game_info.get("last_played", 0),
+                "executable": game_info.get("executable", ""),
+                "icon": game_info.get("icon", "")
+            }
+            recently.move_to_end(game_id, last=False)
             
-        recently = self.config["games"]["recently_launched"]
-        
-        # Remove if already in list
-        recently = [g for g in recently if g["id"] != game_id]
-        
-        # Add to front of list
-        recently.insert(0, {
-            "id": game_id,
-            "name": game_info["name"],
-            "source": game_info["source"],
-            "last_played": game_info.get("last_played", 0),
-            "executable": game_info.get("executable", ""),
-            "icon": game_info.get("icon", "")
-        })
-        
-        # Keep only the latest games
-        max_recent = self.get("games", "max_games_shown", 10) * 2
-        self.config["games"]["recently_launched"] = recently[:max_recent]
-        
-        self.save()
+            # Keep only the latest games
+            max_recent = self.get("games", "max_games_shown", 10) * 2
+            while len(recently) > max_recent:
+                recently.popitem(last=True)
+                
+            self._schedule_save()
+    
+    def remove_recently_launched(self, game_id):
+        """Remove a game from the recently launched games list.
+        
+        Args:
+            game_id: Unique game identifier
+            
+        Returns:
+            True if the game was in the list, False otherwise
+        """
+        with self._lock:
+            recently = self.config["games"]["recently_launched"]
+            if recently.pop(game_id, None) is None:
+                return False
+                
+            self._schedule_save()
+            return True
+    
+    def clear_recently_launched(self):
+        """Remove all games from the recently launched games list.
+        
+        Returns:
+            True if the list had any games, False otherwise
+        """
+        with self._lock:
+            recently = self.config["games"]["recently_launched"]
+            if not recently:
+                return False
+                
+            recently.clear()
+            self._schedule_save()
+            return True
@@ -5,15 +5,32 @@ import os
 import sys
 import time
 import logging
+import functools
 import threading
-import subprocess
 from pathlib import Path
 
-# Pygame for controller input
-import pygame
+# Pygame for controller input, imported lazily by _load_pygame() so that
+# importing this module (e.g. for the systemd helpers) stays cheap
+pygame = None
 
 logger = logging.getLogger('controller-launch.daemon')
 
+# Monotonic clock for press durations, unaffected by wall-clock changes
+_now = time.monotonic
+
+@functools.lru_cache(maxsize=1)
+def _systemd_user_dir():
+    """Get the systemd user unit directory."""
+    return os.path.expanduser("~/.config/systemd/user")
+
+def _load_pygame():
+    """Import pygame on first use and return the module."""
+    global pygame
+    if pygame is None:
+        import pygame as _pygame
+        pygame = _pygame
+    return pygame
+
 class ControllerDaemon:
     """Background service for monitoring controller button presses using pygame."""
     
@@ -21,6 +38,19 @@ class ControllerDaemon:
     # Note: These are common mappings but might need adjustment based on controller/platform
     XBOX_GUIDE_BUTTON = 8  # Xbox guide button (may vary by controller model)
     PS_BUTTON = 10         # PS button (may vary by controller model)
+    GUIDE_BUTTONS = frozenset({XBOX_GUIDE_BUTTON, PS_BUTTON})
+    
+    # Maximum time in milliseconds to block waiting for an event, so the
+    # monitor thread notices stop() promptly
+    EVENT_WAIT_TIMEOUT = 250
+    
+    # Initial number of per-device state slots (grown on demand)
+    INITIAL_DEVICE_SLOTS = 16
+    
+    # Shared joystick subsystem initialization used by detect_controllers
+    _joystick_lock = threading.Lock()
+    _joystick_refcount = 0
+    _owns_joystick = False
     
     def __init__(self, config_manager):
         """Initialize the controller daemon.
@@ -29,12 +59,18 @@ class ControllerDaemon:
             config_manager: ConfigManager instance
         """
         self.config = config_manager
-        self.button_states = {}
-        self.button_times = {}
+        # Per-device button state, indexed by joystick number:
+        # last pressed button (-1 if none) and the time it was pressed
+        self.pressed_buttons = [-1] * self.INITIAL_DEVICE_SLOTS
+        self.press_times = [0.0] * self.INITIAL_DEVICE_SLOTS
         self.running = False
         self.thread = None
         self._pygame_initialized = False
         
+        # Open joysticks keyed by instance ID. pygame closes a joystick when
+        # its object is garbage-collected, which stops its button events.
+        self.joysticks = {}
+        
         # Long press duration in seconds
         self.long_press_duration = self.config.get("controller", "long_press_duration", 1.0)
         
@@ -58,6 +94,7 @@ class ControllerDaemon:
         
         # Quit pygame if initialized
         if self._pygame_initialized:
+            self.joysticks.clear()
             pygame.quit()
             self._pygame_initialized = False
             
@@ -66,6 +103,7 @@ class ControllerDaemon:
         # Initialize pygame
         if not self._pygame_initialized:
             try:
+                _load_pygame()
                 pygame.init()
                 pygame.joystick.init()
                 self._pygame_initialized = True
@@ -73,54 +111,77 @@ class ControllerDaemon:
             except Exception as e:
                 logger.error(f"Failed to initialize pygame: {str(e)}")
                 return
+                
+        # Controllers connected later are picked up via JOYDEVICEADDED
+        self._init_existing_joysticks()
 
-        # Main monitoring loop
+        # Main monitoring loop, re-entered after errors
         while self.running:
             try:
                 self._monitor_controllers()
-                time.sleep(0.01)  # Short sleep to avoid high CPU usage
             except Exception as e:
                 logger.error(f"Error in controller monitor: {str(e)}")
                 time.sleep(1)  # Longer sleep on error
                 
-    def _monitor_controllers(self):
-        """Monitor controllers using pygame."""
-        # Check for connected controllers and initialize new ones
-        joystick_count = pygame.joystick.get_count()
-        for i in range(joystick_count):
-            if not pygame.joystick.Joystick(i).get_init():
-                try:
-                    joystick = pygame.joystick.Joystick(i)
+    def _init_existing_joysticks(self):
+        """Initialize controllers that are already connected."""
+        for i in range(pygame.joystick.get_count()):
+            try:
+                joystick = pygame.joystick.Joystick(i)
+                if not joystick.get_init():
                     joystick.init()
-                    logger.info(f"Initialized controller: {joystick.get_name()}")
-                except Exception as e:
-                    logger.error(f"Failed to initialize joystick {i}: {str(e)}")
-                    
-        # Process events
-        for event in pygame.event.get():
-            self._process_event(event)
+                self.joysticks[joystick.get_instance_id()] = joystick
+                logger.info(f"Initialized controller: {joystick.get_name()}")
+            except Exception as e:
+                logger.error(f"Failed to initialize joystick {i}: {str(e)}")
+                
+    def _ensure_device_slot(self, joy):
+        """Grow the per-device state lists to hold the given joystick index."""
+        missing = joy + 1 - len(self.pressed_buttons)
+        if missing > 0:
+            self.pressed_buttons.extend([-1] * missing)
+            self.press_times.extend([0.0] * missing)
+            
+    def _monitor_controllers(self):
+        """Monitor controllers using pygame until the daemon is stopped."""
+        # Bind the per-event lookups once for the whole loop
+        process = self._process_event
+        wait = pygame.event.wait
+        get = pygame.event.get
+        timeout = self.EVENT_WAIT_TIMEOUT
+        
+        while self.running:
+            # Block until an event arrives instead of busy-polling
+            event = wait(timeout)
+            if event.type != pygame.NOEVENT:
+                process(event)
+                
+                # Drain any events that arrived alongside it
+                for event in get():
+                    process(event)
                 
     def _process_event(self, event):
         """Process a single pygame event."""
         try:
             if event.type == pygame.JOYBUTTONDOWN:
                 # Store button press time
-                device_id = f"pygame_{event.joy}"
+                joy = event.joy
                 button = event.button
-                self.button_states[device_id] = button
-                self.button_times[device_id] = time.time()
-                logger.debug(f"Button {button} pressed on controller {device_id}")
+                self._ensure_device_slot(joy)
+                self.pressed_buttons[joy] = button
+                self.press_times[joy] = _now()
+                logger.debug(f"Button {button} pressed on controller {joy}")
                 
             elif event.type == pygame.JOYBUTTONUP:
-                device_id = f"pygame_{event.joy}"
+                joy = event.joy
                 button = event.button
                 
-                if device_id in self.button_states:
-                    press_time = time.time() - self.button_times.get(device_id, 0)
+                if joy < len(self.pressed_buttons) and self.pressed_buttons[joy] != -1:
+                    press_time = _now() - self.press_times[joy]
                     
                     # Check for guide/PS button long press
                     # These button mappings may need to be adjusted based on controller model
-                    if button in [self.XBOX_GUIDE_BUTTON, self.PS_BUTTON]:
+                    if button in self.GUIDE_BUTTONS:
                         if press_time >= self.long_press_duration:
                             logger.info(f"Guide button long press detected ({press_time:.2f}s)")
                             self._trigger_overlay()
@@ -128,21 +189,22 @@ class ControllerDaemon:
                             logger.debug(f"Guide button short press ignored ({press_time:.2f}s)")
                             
                     # Clean up
-                    del self.button_states[device_id]
-                    if device_id in self.button_times:
-                        del self.button_times[device_id]
+                    self.pressed_buttons[joy] = -1
                         
             elif event.type == pygame.JOYDEVICEADDED:
                 joystick_id = event.device_index
+                self._ensure_device_slot(joystick_id)
                 try:
                     joystick = pygame.joystick.Joystick(joystick_id)
                     joystick.init()
+                    self.joysticks[joystick.get_instance_id()] = joystick
                     logger.info(f"Controller connected: {joystick.get_name()}")
                 except Exception as e:
                     logger.error(f"Error initializing new controller: {str(e)}")
                     
             elif event.type == pygame.JOYDEVICEREMOVED:
                 joystick_id = event.instance_id
+                self.joysticks.pop(joystick_id, None)
                 logger.info(f"Controller disconnected: {joystick_id}")
                 
         except Exception as e:
@@ -151,6 +213,7 @@ class ControllerDaemon:
     def _trigger_overlay(self):
         """Trigger the overlay to appear."""
         logger.info("Launching overlay")
+        import subprocess
         try:
             # Get the path to the main script
             script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -168,6 +231,7 @@ class ControllerDaemon:
     @classmethod
     def install_systemd_service(cls):
         """Install systemd user service for autostart."""
+        import subprocess
         try:
             # Get the path to this script
             script_path = os.path.abspath(__file__)
@@ -175,7 +239,7 @@ class ControllerDaemon:
             main_script = os.path.join(script_dir, "main.py")
             
             # Create user service directory if it doesn't exist
-            service_dir = os.path.expanduser("~/.config/systemd/user")
+            service_dir = _systemd_user_dir()
             os.makedirs(service_dir, exist_ok=True)
             
             # Create service file
@@ -206,13 +270,14 @@ WantedBy=graphical-session.target
     @classmethod
     def uninstall_systemd_service(cls):
         """Uninstall systemd user service."""
+        import subprocess
         try:
             # Stop and disable the service
             subprocess.run(["systemctl", "--user", "stop", "controller-launch.service"])
             subprocess.run(["systemctl", "--user", "disable", "controller-launch.service"])
             
             # Remove service file
-            service_path = os.path.expanduser("~/.config/systemd/user/controller-launch.service")
+            service_path = os.path.join(_systemd_user_dir(), "controller-launch.service")
             if os.path.exists(service_path):
                 os.unlink(service_path)
                 
@@ -228,14 +293,8 @@ WantedBy=graphical-session.target
             List of controller names
         """
         controllers = []
+        cls._acquire_joystick()
         
-        # Initialize pygame temporarily
-        temp_init = False
-        if not pygame.get_init():
-            pygame.init()
-            pygame.joystick.init()
-            temp_init = True
-            
         try:
             # Get list of controllers
             joystick_count = pygame.joystick.get_count()
@@ -256,11 +315,33 @@ WantedBy=graphical-session.target
                         'axes': 0
                     })
         finally:
-            # Quit pygame if we initialized it
-            if temp_init:
-                pygame.quit()
+            cls._release_joystick()
                 
         return controllers
+        
+    @classmethod
+    def _acquire_joystick(cls):
+        """Make sure the pygame joystick subsystem is initialized.
+        
+        Only the joystick subsystem is started, which is much cheaper than a
+        full pygame.init(). Calls are reference counted so nested users share
+        one initialization.
+        """
+        _load_pygame()
+        with cls._joystick_lock:
+            if cls._joystick_refcount == 0 and not pygame.joystick.get_init():
+                pygame.joystick.init()
+                cls._owns_joystick = True
+            cls._joystick_refcount += 1
+            
+    @classmethod
+    def _release_joystick(cls):
+        """Release a reference taken by _acquire_joystick()."""
+        with cls._joystick_lock:
+            cls._joystick_refcount -= 1
+            if cls._joystick_refcount == 0 and cls._owns_joystick:
+                pygame.joystick.quit()
+                cls._owns_joystick = False
 
 # For direct testing
 if __name__ == "__main__":
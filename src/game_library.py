@@ -5,18 +5,104 @@
 import os
 import re
 import json
-import glob
 import time
 import logging
+import tempfile
 import subprocess
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 logger = logging.getLogger('controller-launch.library')
 
+# Use inotify to learn about library changes when it is available. Events
+# are read from the GLib main loop, so both are needed.
+try:
+    from gi.repository import GLib
+    from inotify_simple import INotify, flags as inotify_flags
+    
+    _INOTIFY_MASK = (
+        inotify_flags.CREATE | inotify_flags.DELETE | inotify_flags.MODIFY |
+        inotify_flags.CLOSE_WRITE | inotify_flags.MOVED_FROM | inotify_flags.MOVED_TO |
+        inotify_flags.DELETE_SELF | inotify_flags.MOVE_SELF
+    )
+except ImportError:
+    INotify = None
+
+# Home directory, resolved once for all path expansion
+_HOME = os.path.expanduser('~')
+_FLATPAK_USER_DIR = os.path.join(_HOME, ".local/share/flatpak")
+_FLATPAK_USER_ICONS = os.path.join(_FLATPAK_USER_DIR, "exports/share/icons/hicolor")
+
+def _expand_user(path):
+    """Expand a leading ~ to the current user's home directory."""
+    if path == '~' or path.startswith('~/'):
+        return _HOME + path[1:]
+    if path.startswith('~'):
+        # ~otheruser paths need a password database lookup
+        return os.path.expanduser(path)
+    return path
+
+# Common game-related Flatpak app ID patterns, combined into one regex
+_FLATPAK_GAME_RE = re.compile(
+    r'\.Game$|game|play|steam|itch|^com\.valvesoftware|^io\.itch|^net\.lutris',
+    re.IGNORECASE
+)
+_DESKTOP_CATEGORIES_RE = re.compile(r'Categories=([^\n]+)')
+
+# Directories that never contain games and are not descended into when
+# walking custom paths
+_SKIPPED_DIRS = frozenset({'.git', 'node_modules', '__pycache__', '.cache'})
+
+def _find_vdf_value(content, key, start=0):
+    """Find the quoted value following a quoted key in VDF/ACF content.
+    
+    Args:
+        content: VDF file content
+        key: Key name (without quotes)
+        start: Index to start searching from
+        
+    Returns:
+        Tuple of (value, end_index), or (None, -1) if not found
+    """
+    needle = f'"{key}"'
+    length = len(content)
+    i = content.find(needle, start)
+    while i != -1:
+        j = i + len(needle)
+        
+        # Skip whitespace between key and value
+        while j < length and content[j] in ' \t\r\n':
+            j += 1
+            
+        # Keys followed by a block ({) rather than a string are skipped
+        if j < length and content[j] == '"':
+            k = content.find('"', j + 1)
+            if k != -1:
+                return content[j + 1:k], k + 1
+                
+        i = content.find(needle, j)
+        
+    return None, -1
+
 class GameLibrary:
     """Manages game discovery and launching from various sources."""
     
+    # Bump when the cached game info format changes
+    CACHE_VERSION = 2
+    
+    # Seconds before sources that cannot be watched are checked again
+    RESCAN_INTERVAL = 300
+    
+    # Milliseconds to wait after an inotify event before rescanning, so a
+    # burst of changes (e.g. a game being installed) causes one rescan
+    RESCAN_DELAY = 2000
+    
+    # Sources that only record their top-level directories, since their
+    # trees can be arbitrarily large. Changes deeper down are picked up by
+    # the periodic check.
+    SHALLOW_SOURCES = frozenset({"custom"})
+    
     def __init__(self, config_manager):
         """Initialize the game library.
         
@@ -25,7 +111,35 @@ class GameLibrary:
         """
         self.config = config_manager
         self.games = {}  # ID -> game info
+        self.version = 0  # Bumped whenever games or their recency change
         self.last_scan_time = 0
+        self.cache_path = os.path.join(_HOME, ".config/controller-launch/library.cache.json")
+        
+        # Launch handlers keyed by the source prefix of the game ID; other
+        # games are run directly
+        self._launchers = {
+            "steam": self._launch_url,
+            "flatpak": self._launch_command,
+            "lutris": self._launch_command,
+        }
+        
+        # Latest scan result per source, see scan_all_sources()
+        self._source_entries = {}
+        
+        # Game ID -> last launch timestamp, kept apart from the game info
+        # dicts so they can be shared with callers and the scan cache
+        self._last_played = {
+            recent["id"]: recent.get("last_played", 0)
+            for recent in self.config.get("games", "recently_launched", [])
+        }
+        
+        # Change notification state: sources whose watches reported changes,
+        # sources that could not be fully watched, and inotify wd -> sources
+        self._inotify = self._create_inotify()
+        self._dirty_sources = set()
+        self._unwatched_sources = set()
+        self._wd_sources = {}
+        self._rescan_id = None
         
         # Scan for games initially
         self.scan_all_sources()
@@ -33,42 +147,299 @@ class GameLibrary:
     def scan_all_sources(self, force=False):
         """Scan all configured game sources.
         
+        When inotify is available, only sources whose directories reported
+        changes are rescanned. Other sources fall back to a periodic check.
+        Games of rescanned sources are merged into the library incrementally.
+        
         Args:
             force: Force a rescan even if cache is recent
+            
+        Returns:
+            Tuple of (added, removed) sets of game IDs
         """
-        # Skip if we've scanned recently (within last 5 minutes)
+        scanners = {
+            "steam": self._scan_steam,
+            "flatpak": self._scan_flatpak,
+            "lutris": self._scan_lutris,
+            "custom": self._scan_custom_paths,
+        }
+        game_paths = self.config.get("games", "paths", {})
+        
         current_time = time.time()
-        if not force and current_time - self.last_scan_time < 300:
-            return
+        self._read_inotify_events()
+        dirty = set(self._dirty_sources)
+        if force or not self._source_entries:
+            pending = set(scanners)
+        else:
+            pending = set(dirty)
+            
+            # Sources without complete watches are checked every few
+            # minutes; those whose watched paths are unchanged are served
+            # from their previous results. Shallow sources are always
+            # rescanned then, as their mtimes only cover the top level.
+            if current_time - self.last_scan_time >= self.RESCAN_INTERVAL:
+                pending |= self._unwatched_sources
+                dirty |= self.SHALLOW_SOURCES
+                
+            # Changed settings are not visible to inotify
+            pending.update(
+                source for source, entry in self._source_entries.items()
+                if entry["settings"] != game_paths.get(source)
+            )
+            
+            if not pending:
+                return set(), set()
         
-        logger.info("Scanning for games from all sources")
+        logger.info(f"Scanning for games from {', '.join(sorted(pending))}")
         
-        # Reset game list while keeping last_played data
-        last_played_data = {}
-        for game_id, game_info in self.games.items():
-            if 'last_played' in game_info:
-                last_played_data[game_id] = game_info['last_played']
+        # Reuse on-disk results for sources whose watched paths are unchanged
+        cache = {} if force else (self._source_entries or self._load_scan_cache())
         
-        self.games = {}
+        def scan_source(source, scan):
+            settings = game_paths.get(source)
+            entry = cache.get(source)
+            # Sources with inotify events are rescanned even if the mtimes of
+            # their watched paths did not change (e.g. a file inside a
+            # watched directory was rewritten)
+            if (entry and source not in dirty and entry.get("settings") == settings
+                    and self._watched_paths_unchanged(entry["paths"])):
+                logger.info(f"Using cached {source} games")
+                return source, {"settings": settings, "paths": entry["paths"], "games": entry["games"]}, False, False
+                
+            # Scanners return None (or raise) when the scan failed as a
+            # whole; the previous results are then kept rather than being
+            # replaced by an empty library
+            watched = {}
+            try:
+                games = scan(watched)
+            except Exception as e:
+                logger.error(f"Error scanning {source} games: {str(e)}")
+                games = None
+            if games is None:
+                if entry and entry.get("settings") == settings:
+                    return source, entry, False, True
+                return source, None, False, True
+            return source, {"settings": settings, "paths": watched, "games": games}, True, False
         
-        # Scan each source
-        self._scan_steam()
-        self._scan_flatpak()
-        self._scan_lutris()
-        self._scan_custom_paths()
+        # Scan each source concurrently; scanners are dominated by filesystem
+        # and subprocess IO and each returns its own {game_id: info} dict
+        with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+            results = list(executor.map(
+                lambda source: scan_source(source, scanners[source]),
+                [source for source in scanners if source in pending]
+            ))
         
-        # Restore last played data
-        for game_id, timestamp in last_played_data.items():
-            if game_id in self.games:
-                self.games[game_id]['last_played'] = timestamp
+        # Apply the difference between old and new results of each source
+        added = set()
+        removed = set()
+        for source, entry, _, failed in results:
+            if failed:
+                # Retry failed sources with the periodic check
+                self._unwatched_sources.add(source)
+                if entry is None:
+                    continue
+                    
+            old_games = self._source_entries.get(source, {}).get("games", {})
+            new_games = entry["games"]
+            self._source_entries[source] = entry
+            if not failed:
+                self._watch_source(source, entry["paths"])
+            
+            # Results reused from the cache are the same dict as before
+            if new_games is old_games:
+                continue
+            self.version += 1
+                
+            removed_ids = old_games.keys() - new_games.keys()
+            for game_id in removed_ids:
+                self.games.pop(game_id, None)
+            self.games.update(new_games)
+            
+            added |= new_games.keys() - old_games.keys()
+            removed |= removed_ids
+        
+        # Persist results if any source was rescanned
+        if any(rescanned for _, _, rescanned, _ in results):
+            self._save_scan_cache(self._source_entries)
         
         # Update last scan time
         self.last_scan_time = current_time
         
-        logger.info(f"Found {len(self.games)} games from all sources")
+        logger.info(f"Found {len(self.games)} games from all sources ({len(added)} added, {len(removed)} removed)")
+        return added, removed
+    
+    def _create_inotify(self):
+        """Create the inotify instance used to watch game directories.
+        
+        Its fd is attached to the GLib main loop so events are picked up
+        while the application is idle.
+        
+        Returns:
+            INotify instance, or None if inotify is unavailable
+        """
+        if INotify is None:
+            return None
+        try:
+            inotify = INotify(nonblocking=True)
+        except OSError as e:
+            logger.warning(f"inotify unavailable, falling back to periodic rescans: {str(e)}")
+            return None
+            
+        GLib.io_add_watch(inotify.fileno(), GLib.PRIORITY_DEFAULT, GLib.IO_IN, self._on_inotify_readable)
+        return inotify
+    
+    def _on_inotify_readable(self, fd, condition):
+        """Drain inotify events on the main loop and schedule a rescan.
+        
+        Returns:
+            True to keep the watch installed
+        """
+        self._read_inotify_events()
+        if self._dirty_sources and self._rescan_id is None:
+            self._rescan_id = GLib.timeout_add(self.RESCAN_DELAY, self._rescan_dirty_sources)
+        return True
+    
+    def _rescan_dirty_sources(self):
+        """Rescan the sources whose watches reported changes."""
+        self._rescan_id = None
+        self.scan_all_sources()
+        return False
+    
+    def _watch_source(self, source, paths):
+        """Replace the inotify watches of a source with watches on its paths.
+        
+        Args:
+            source: Source name
+            paths: Dict of path -> mtime as recorded by _watch()
+        """
+        self._dirty_sources.discard(source)
+        if self._inotify is None:
+            self._unwatched_sources.add(source)
+            return
+            
+        # Drop watches only this source was using
+        for wd, sources in list(self._wd_sources.items()):
+            sources.discard(source)
+            if not sources:
+                del self._wd_sources[wd]
+                try:
+                    self._inotify.rm_watch(wd)
+                except OSError:
+                    pass
+        
+        complete = source not in self.SHALLOW_SOURCES
+        for path, mtime in paths.items():
+            if mtime is None:
+                # Missing paths cannot be watched until they appear
+                complete = False
+                continue
+            try:
+                wd = self._inotify.add_watch(path, _INOTIFY_MASK)
+            except OSError:
+                complete = False
+                continue
+            self._wd_sources.setdefault(wd, set()).add(source)
+        
+        if complete:
+            self._unwatched_sources.discard(source)
+        else:
+            self._unwatched_sources.add(source)
+            
+        # Catch changes made between scanning and adding the watches
+        if not self._watched_paths_unchanged(paths):
+            self._dirty_sources.add(source)
+    
+    def _read_inotify_events(self):
+        """Mark sources dirty for every pending inotify event."""
+        if self._inotify is None:
+            return
+        try:
+            events = self._inotify.read(timeout=0)
+        except OSError as e:
+            logger.warning(f"Error reading inotify events: {str(e)}")
+            self._dirty_sources.update(self._source_entries)
+            return
+            
+        for event in events:
+            if event.mask & inotify_flags.Q_OVERFLOW:
+                # Events were lost, so any source may have changed
+                self._dirty_sources.update(self._source_entries)
+            else:
+                self._dirty_sources.update(self._wd_sources.get(event.wd, ()))
+    
+    def _load_scan_cache(self):
+        """Load cached scan results.
+        
+        Returns:
+            Dict of source name -> cache entry, empty if unavailable
+        """
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            if cache.get("version") == self.CACHE_VERSION:
+                return cache.get("sources", {})
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable library cache: {str(e)}")
+        return {}
+    
+    def _save_scan_cache(self, sources):
+        """Write scan results to the on-disk cache.
+        
+        Args:
+            sources: Dict of source name -> cache entry
+        """
+        tmp_path = None
+        try:
+            cache_dir = os.path.dirname(self.cache_path)
+            os.makedirs(cache_dir, exist_ok=True)
+            with tempfile.NamedTemporaryFile('w', dir=cache_dir, suffix='.tmp', delete=False, encoding='utf-8') as f:
+                tmp_path = f.name
+                json.dump({"version": self.CACHE_VERSION, "sources": sources}, f)
+            os.replace(tmp_path, self.cache_path)
+        except Exception as e:
+            if tmp_path and os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            logger.error(f"Error saving library cache: {str(e)}")
+    
+    def _watch(self, watched, path):
+        """Record the modification time of a path a scanner depends on.
+        
+        Args:
+            watched: Dict of path -> mtime (ns), or None if the path is missing
+            path: File or directory path
+        """
+        try:
+            watched[path] = os.stat(path).st_mtime_ns
+        except OSError:
+            watched[path] = None
     
-    def _scan_steam(self):
-        """Scan for Steam games."""
+    def _watched_paths_unchanged(self, watched):
+        """Check whether every recorded path still has the same mtime.
+        
+        Args:
+            watched: Dict of path -> mtime as recorded by _watch()
+            
+        Returns:
+            True if cached results for these paths are still valid
+        """
+        current = {}
+        for path, mtime in watched.items():
+            self._watch(current, path)
+            if current[path] != mtime:
+                return False
+        return True
+    
+    def _scan_steam(self, watched):
+        """Scan for Steam games.
+        
+        Args:
+            watched: Dict filled with the paths the scan depends on
+            
+        Returns:
+            Dict of game ID -> game info
+        """
         logger.info("Scanning for Steam games")
         
         steam_paths = self.config.get("games", "paths", {}).get("steam", [])
@@ -76,11 +447,12 @@ class GameLibrary:
             steam_paths = ["~/.steam", "~/.local/share/Steam"]
             
         # Expand paths
-        steam_paths = [os.path.expanduser(path) for path in steam_paths]
+        steam_paths = [_expand_user(path) for path in steam_paths]
         
-        found_games = 0
+        games = {}
         
         for steam_path in steam_paths:
+            self._watch(watched, steam_path)
             if not os.path.exists(steam_path):
                 continue
                 
@@ -90,28 +462,36 @@ class GameLibrary:
                 os.path.join(steam_path, "steam", "steamapps", "libraryfolders.vdf")
             ]
             
-            library_paths = []
+            # Insertion-ordered set, so duplicate libraries are scanned once
+            library_paths = {}
             
             for vdf_path in vdf_paths:
+                self._watch(watched, vdf_path)
                 if os.path.exists(vdf_path):
                     # Parse VDF file to extract library paths
-                    library_paths.extend(self._parse_steam_libraryfolders(vdf_path))
+                    library_paths.update(dict.fromkeys(self._parse_steam_libraryfolders(vdf_path)))
             
             # Always add the default steamapps directory
-            default_apps = os.path.join(steam_path, "steamapps")
-            if os.path.exists(default_apps) and default_apps not in library_paths:
-                library_paths.append(default_apps)
+            library_paths[os.path.join(steam_path, "steamapps")] = None
             
-            # Look for appmanifest_*.acf files in each library
+            # Look for appmanifest_*.acf files in each library; missing
+            # libraries are skipped when listing them fails
             for library_path in library_paths:
-                if not os.path.exists(library_path):
+                self._watch(watched, library_path)
+                self._watch(watched, os.path.join(library_path, "common"))
+                
+                # Collect (app_id, path) for every appmanifest_<app_id>.acf
+                try:
+                    with os.scandir(library_path) as it:
+                        app_manifests = [
+                            (entry.name[12:-4], entry.path) for entry in it
+                            if entry.name.startswith("appmanifest_") and entry.name.endswith(".acf")
+                        ]
+                except OSError:
                     continue
-                    
-                app_manifests = glob.glob(os.path.join(library_path, "appmanifest_*.acf"))
                 
-                for manifest in app_manifests:
+                for app_id, manifest in app_manifests:
                     try:
-                        app_id = os.path.basename(manifest).replace("appmanifest_", "").replace(".acf", "")
                         app_data = self._parse_steam_appmanifest(manifest)
                         
                         if not app_data:
@@ -122,20 +502,23 @@ class GameLibrary:
                         # Check for executable
                         install_dir = os.path.join(library_path, "common", app_data.get('installdir', ''))
                         
-                        if not os.path.exists(install_dir):
+                        # Read the install directory once; skip the game if it is missing
+                        try:
+                            with os.scandir(install_dir) as it:
+                                entries = {entry.name for entry in it}
+                        except (FileNotFoundError, NotADirectoryError):
                             continue
                         
                         # Try to find an icon
                         icon_path = None
                         for icon_file in ['logo.png', 'header.jpg', 'icon.png', 'steam_icon.png']:
-                            potential_icon = os.path.join(install_dir, icon_file)
-                            if os.path.exists(potential_icon):
-                                icon_path = potential_icon
+                            if icon_file in entries:
+                                icon_path = os.path.join(install_dir, icon_file)
                                 break
                         
                         # Store game info
                         game_id = f"steam:{app_id}"
-                        self.games[game_id] = {
+                        games[game_id] = {
                             'id': game_id,
                             'name': name,
                             'source': 'Steam',
@@ -144,11 +527,11 @@ class GameLibrary:
                             'icon': icon_path,
                             'app_id': app_id,
                         }
-                        found_games += 1
                     except Exception as e:
                         logger.error(f"Error parsing Steam app manifest {manifest}: {str(e)}")
         
-        logger.info(f"Found {found_games} Steam games")
+        logger.info(f"Found {len(games)} Steam games")
+        return games
     
     def _parse_steam_libraryfolders(self, vdf_path):
         """Parse Steam libraryfolders.vdf file to get library paths.
@@ -165,15 +548,14 @@ class GameLibrary:
             with open(vdf_path, 'r', encoding='utf-8') as f:
                 content = f.read()
             
-            # Extract paths using regex
+            # Extract every "path" value
             # This is a simple parser and might break with VDF format changes
-            path_matches = re.finditer(r'"path"\s+"([^"]+)"', content)
-            
-            for match in path_matches:
-                path = match.group(1).replace('\\\\', '/')
-                steamapps_path = os.path.join(path, "steamapps")
-                if os.path.exists(steamapps_path):
-                    library_paths.append(steamapps_path)
+            path, pos = _find_vdf_value(content, "path")
+            while path is not None:
+                if path:
+                    path = path.replace('\\\\', '/')
+                    library_paths.append(os.path.join(path, "steamapps"))
+                path, pos = _find_vdf_value(content, "path", pos)
         except Exception as e:
             logger.error(f"Error parsing Steam library folders: {str(e)}")
         
@@ -190,176 +572,217 @@ class GameLibrary:
         """
         try:
             with open(manifest_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Extract key fields using regex
-            name_match = re.search(r'"name"\s+"([^"]+)"', content)
-            installdir_match = re.search(r'"installdir"\s+"([^"]+)"', content)
+                # The fields we need are near the top; only read the rest
+                # of the file if they were not found in the first chunk
+                content = f.read(4096)
+                
+                # Extract key fields
+                name, _ = _find_vdf_value(content, "name")
+                installdir, _ = _find_vdf_value(content, "installdir")
+                
+                if name is None or installdir is None:
+                    rest = f.read()
+                    if rest:
+                        content += rest
+                        name, _ = _find_vdf_value(content, "name")
+                        installdir, _ = _find_vdf_value(content, "installdir")
             
             return {
-                'name': name_match.group(1) if name_match else None,
-                'installdir': installdir_match.group(1) if installdir_match else None,
+                'name': name or None,
+                'installdir': installdir or None,
             }
         except Exception as e:
             logger.error(f"Error parsing Steam app manifest {manifest_path}: {str(e)}")
             return None
     
-    def _scan_flatpak(self):
-        """Scan for Flatpak games."""
+    def _scan_flatpak(self, watched):
+        """Scan for Flatpak games.
+        
+        Args:
+            watched: Dict filled with the paths the scan depends on
+            
+        Returns:
+            Dict of game ID -> game info, or None if listing the apps failed
+        """
         logger.info("Scanning for Flatpak games")
         
-        # Check if flatpak is installed
-        try:
-            subprocess.run(['flatpak', '--version'], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        except (subprocess.SubprocessError, FileNotFoundError):
-            logger.info("Flatpak not installed, skipping")
-            return
+        # Installing or removing apps updates these directories
+        for app_dir in [os.path.join(_FLATPAK_USER_DIR, "app"), "/var/lib/flatpak/app"]:
+            self._watch(watched, app_dir)
         
-        found_games = 0
+        games = {}
         
         try:
-            # Get list of installed Flatpak apps
+            # Index exported desktop files once instead of querying each app
+            desktop_map = self._find_flatpak_desktop_files(watched)
+            
+            # List icon directories once rather than probing paths per app
+            icon_index = self._index_flatpak_icon_dirs()
+            
+            # Get list of installed Flatpak apps; the output is kept as bytes
+            # and only the columns used are decoded
             result = subprocess.run(
-                ['flatpak', 'list', '--app', '--columns=application,name,version'],
+                ['flatpak', 'list', '--app', '--columns=application,name'],
                 stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
+                stderr=subprocess.DEVNULL,
                 check=True
             )
             
             # Parse output
-            lines = result.stdout.strip().split('\n')
-            for line in lines:
-                if not line.strip():
-                    continue
-                
-                parts = line.split('\t')
+            for line in result.stdout.splitlines():
+                parts = line.split(b'\t', 2)
                 if len(parts) < 2:
                     continue
                 
-                app_id = parts[0].strip()
-                name = parts[1].strip() if len(parts) > 1 else app_id
+                app_id = parts[0].strip().decode('utf-8', 'replace')
+                if not app_id:
+                    continue
+                name = parts[1].strip().decode('utf-8', 'replace') or app_id
                 
                 # Check if this is a game
                 # There's no perfect way to do this, but we can check the app_id
-                if self._is_flatpak_game(app_id):
-                    icon_path = self._find_flatpak_icon(app_id)
+                if self._is_flatpak_game(app_id, desktop_map):
+                    icon_path = self._find_flatpak_icon(app_id, icon_index)
                     
                     # Store game info
                     game_id = f"flatpak:{app_id}"
-                    self.games[game_id] = {
+                    games[game_id] = {
                         'id': game_id,
                         'name': name,
                         'source': 'Flatpak',
                         'executable': f"flatpak run {app_id}",
+                        'argv': ['flatpak', 'run', app_id],
                         'icon': icon_path,
                         'app_id': app_id,
                     }
-                    found_games += 1
+        except FileNotFoundError:
+            logger.info("Flatpak not installed, skipping")
+            return {}
         except Exception as e:
             logger.error(f"Error scanning Flatpak games: {str(e)}")
+            return None
         
-        logger.info(f"Found {found_games} Flatpak games")
+        logger.info(f"Found {len(games)} Flatpak games")
+        return games
     
-    def _is_flatpak_game(self, app_id):
+    def _is_flatpak_game(self, app_id, desktop_map):
         """Check if a Flatpak app is likely a game.
         
         Args:
             app_id: Flatpak application ID
+            desktop_map: Dict from _find_flatpak_desktop_files()
             
         Returns:
             True if likely a game, False otherwise
         """
         # Check for common game-related app ID patterns
-        game_patterns = [
-            r'\.Game$',
-            r'game',
-            r'play',
-            r'steam',
-            r'itch',
-            r'^com\.valvesoftware',
-            r'^io\.itch',
-            r'^net\.lutris',
-        ]
+        if _FLATPAK_GAME_RE.search(app_id):
+            return True
         
-        for pattern in game_patterns:
-            if re.search(pattern, app_id, re.IGNORECASE):
-                return True
+        # Check desktop file for game category
+        for desktop_path in desktop_map.get(app_id, ()):
+            try:
+                with open(desktop_path, 'r', encoding='utf-8') as f:
+                    content = f.read()
+                    
+                # Check for game category
+                categories_match = _DESKTOP_CATEGORIES_RE.search(content)
+                if categories_match:
+                    categories = categories_match.group(1).lower()
+                    if 'game' in categories:
+                        return True
+            except Exception as e:
+                logger.error(f"Error checking if {app_id} is a game: {str(e)}")
         
-        # Try to check desktop file for game category
-        try:
-            # Find desktop file
-            result = subprocess.run(
-                ['flatpak', 'info', app_id],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
-            
-            output = result.stdout
-            
-            # Look for Application section
-            app_section = re.search(r'Application:\s*([^\n]+)', output)
-            if not app_section:
-                return False
-                
-            app_name = app_section.group(1).strip()
-            
-            # Check desktop file for game category
-            desktop_paths = [
-                os.path.expanduser(f"~/.local/share/flatpak/exports/share/applications/{app_id}.desktop"),
-                f"/var/lib/flatpak/exports/share/applications/{app_id}.desktop",
-            ]
+        return False
+    
+    def _find_flatpak_desktop_files(self, watched):
+        """Map Flatpak application IDs to their exported desktop files.
+        
+        Args:
+            watched: Dict filled with the export directories read
             
-            for desktop_path in desktop_paths:
-                if os.path.exists(desktop_path):
-                    with open(desktop_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        
-                    # Check for game category
-                    categories_match = re.search(r'Categories=([^\n]+)', content)
-                    if categories_match:
-                        categories = categories_match.group(1).lower()
-                        if 'game' in categories:
-                            return True
-        except Exception as e:
-            logger.error(f"Error checking if {app_id} is a game: {str(e)}")
+        Returns:
+            Dict of app ID -> list of desktop file paths (user exports first)
+        """
+        desktop_map = {}
+        export_dirs = [
+            os.path.join(_FLATPAK_USER_DIR, "exports/share/applications"),
+            "/var/lib/flatpak/exports/share/applications",
+        ]
         
-        return False
+        for export_dir in export_dirs:
+            self._watch(watched, export_dir)
+            try:
+                with os.scandir(export_dir) as it:
+                    for entry in it:
+                        if entry.name.endswith('.desktop'):
+                            desktop_map.setdefault(entry.name[:-8], []).append(entry.path)
+            except OSError:
+                continue
+        
+        return desktop_map
     
-    def _find_flatpak_icon(self, app_id):
+    def _index_flatpak_icon_dirs(self):
+        """List the icon directories searched for Flatpak app icons.
+        
+        Returns:
+            List of (directory, set of file names) in lookup order; missing
+            directories have an empty set
+        """
+        icon_dirs = [
+            f"{_FLATPAK_USER_ICONS}/128x128/apps",
+            f"{_FLATPAK_USER_ICONS}/scalable/apps",
+            "/var/lib/flatpak/exports/share/icons/hicolor/128x128/apps",
+            "/var/lib/flatpak/exports/share/icons/hicolor/scalable/apps",
+            "/usr/share/icons/hicolor/128x128/apps",
+            "/usr/share/icons/hicolor/scalable/apps",
+        ]
+        
+        icon_index = []
+        for icon_dir in icon_dirs:
+            try:
+                with os.scandir(icon_dir) as it:
+                    names = {entry.name for entry in it}
+            except OSError:
+                names = set()
+            icon_index.append((icon_dir, names))
+        
+        return icon_index
+    
+    def _find_flatpak_icon(self, app_id, icon_index):
         """Find icon for a Flatpak application.
         
         Args:
             app_id: Flatpak application ID
+            icon_index: List from _index_flatpak_icon_dirs()
             
         Returns:
             Path to icon or None
         """
-        # Try several common icon locations
-        icon_paths = [
-            os.path.expanduser(f"~/.local/share/flatpak/exports/share/icons/hicolor/128x128/apps/{app_id}.png"),
-            os.path.expanduser(f"~/.local/share/flatpak/exports/share/icons/hicolor/scalable/apps/{app_id}.svg"),
-            f"/var/lib/flatpak/exports/share/icons/hicolor/128x128/apps/{app_id}.png",
-            f"/var/lib/flatpak/exports/share/icons/hicolor/scalable/apps/{app_id}.svg",
-        ]
-        
-        # Check system icon theme if app_id contains a dot
+        # File names to look for in each icon directory, in the same order;
+        # Flatpak exports are named after the app ID, the system icon theme
+        # after its last component
+        file_names = [f"{app_id}.png", f"{app_id}.svg", f"{app_id}.png", f"{app_id}.svg"]
         if '.' in app_id:
             icon_name = app_id.split('.')[-1]
-            icon_paths.extend([
-                f"/usr/share/icons/hicolor/128x128/apps/{icon_name}.png",
-                f"/usr/share/icons/hicolor/scalable/apps/{icon_name}.svg",
-            ])
+            file_names.extend([f"{icon_name}.png", f"{icon_name}.svg"])
         
-        for path in icon_paths:
-            if os.path.exists(path):
-                return path
+        for (icon_dir, names), file_name in zip(icon_index, file_names):
+            if file_name in names:
+                return os.path.join(icon_dir, file_name)
         
         return None
     
-    def _scan_lutris(self):
-        """Scan for Lutris games."""
+    def _scan_lutris(self, watched):
+        """Scan for Lutris games.
+        
+        Args:
+            watched: Dict filled with the paths the scan depends on
+            
+        Returns:
+            Dict of game ID -> game info
+        """
         logger.info("Scanning for Lutris games")
         
         lutris_paths = self.config.get("games", "paths", {}).get("lutris", [])
@@ -367,36 +790,50 @@ class GameLibrary:
             lutris_paths = ["~/.local/share/lutris"]
             
         # Expand paths
-        lutris_paths = [os.path.expanduser(path) for path in lutris_paths]
+        lutris_paths = [_expand_user(path) for path in lutris_paths]
         
-        found_games = 0
+        games = {}
         
         for lutris_path in lutris_paths:
+            self._watch(watched, lutris_path)
             if not os.path.exists(lutris_path):
                 continue
                 
             # Look for game configs
             config_dir = os.path.join(lutris_path, "games")
+            self._watch(watched, config_dir)
+            self._watch(watched, os.path.join(lutris_path, "banners"))
             if not os.path.exists(config_dir):
                 continue
                 
+            try:
+                with os.scandir(config_dir) as it:
+                    config_files = [
+                        entry.path for entry in it
+                        if entry.name.endswith(".yml") and not entry.name.startswith(".")
+                    ]
+            except OSError:
+                continue
+                
             # Parse each game config
-            for config_file in glob.glob(os.path.join(config_dir, "*.yml")):
+            for config_file in config_files:
                 try:
                     # Basic YAML parsing without pyyaml dependency
                     with open(config_file, 'r', encoding='utf-8') as f:
                         content = f.read()
                     
-                    # Extract key fields using regex
-                    name_match = re.search(r'name: (.+)', content)
-                    slug_match = re.search(r'slug: (.+)', content)
+                    # Extract key fields
+                    name = slug = None
+                    for line in content.splitlines():
+                        line = line.strip()
+                        if name is None and line.startswith('name: '):
+                            name = line[6:].strip()
+                        elif slug is None and line.startswith('slug: '):
+                            slug = line[6:].strip()
                     
-                    if not name_match or not slug_match:
+                    if not name or not slug:
                         continue
                     
-                    name = name_match.group(1).strip()
-                    slug = slug_match.group(1).strip()
-                    
                     # Look for icon
                     icon_path = os.path.join(lutris_path, "banners", f"{slug}.jpg")
                     if not os.path.exists(icon_path):
@@ -404,77 +841,126 @@ class GameLibrary:
                     
                     # Store game info
                     game_id = f"lutris:{slug}"
-                    self.games[game_id] = {
+                    games[game_id] = {
                         'id': game_id,
                         'name': name,
                         'source': 'Lutris',
                         'executable': f"lutris lutris:{slug}",
+                        'argv': ['lutris', f"lutris:{slug}"],
                         'icon': icon_path,
                         'slug': slug,
                     }
-                    found_games += 1
                 except Exception as e:
                     logger.error(f"Error parsing Lutris config {config_file}: {str(e)}")
         
-        logger.info(f"Found {found_games} Lutris games")
+        logger.info(f"Found {len(games)} Lutris games")
+        return games
     
-    def _scan_custom_paths(self):
-        """Scan custom paths defined by the user."""
+    def _scan_custom_paths(self, watched):
+        """Scan custom paths defined by the user.
+        
+        Args:
+            watched: Dict filled with the paths the scan depends on
+            
+        Returns:
+            Dict of game ID -> game info
+        """
         logger.info("Scanning custom game paths")
         
         custom_paths = self.config.get("games", "paths", {}).get("custom", [])
         
         # Expand paths
-        custom_paths = [os.path.expanduser(path) for path in custom_paths]
+        custom_paths = [_expand_user(path) for path in custom_paths]
         
-        found_games = 0
+        games = {}
         
         for path in custom_paths:
-            if not os.path.exists(path) or not os.path.isdir(path):
-                continue
-                
             # Look for executable files
-            for root, dirs, files in os.walk(path):
-                for file in files:
-                    # Skip if already too many games found in this path
-                    if found_games > 100:
-                        logger.warning(f"Too many potential games found in {path}, stopping scan")
+            self._watch(watched, path)
+            for root, files in self._walk_files(path):
+                # Stop walking this path once too many games were found
+                if len(games) > 100:
+                    logger.warning(f"Too many potential games found in {path}, stopping scan")
+                    break
+                    
+                names = {entry.name for entry in files}
+                
+                # Look for icon
+                icon_path = None
+                for icon_file in ['icon.png', 'icon.jpg', 'logo.png', 'logo.jpg']:
+                    if icon_file in names:
+                        icon_path = os.path.join(root, icon_file)
+                        break
+                
+                for entry in files:
+                    if len(games) > 100:
                         break
                         
-                    file_path = os.path.join(root, file)
-                    
-                    # Check if file is executable
-                    if not os.access(file_path, os.X_OK):
+                    # Skip common non-game executables
+                    if entry.name in ['steam', 'lutris', 'flatpak', 'python', 'python3']:
                         continue
                         
-                    # Skip common non-game executables
-                    if file in ['steam', 'lutris', 'flatpak', 'python', 'python3']:
+                    # Check if file is executable using the cached stat result
+                    try:
+                        if not entry.stat().st_mode & 0o111:
+                            continue
+                    except OSError:
                         continue
                         
                     # Use directory name as game name
                     name = os.path.basename(root)
                     
-                    # Look for icon
-                    icon_path = None
-                    for icon_file in ['icon.png', 'icon.jpg', 'logo.png', 'logo.jpg']:
-                        potential_icon = os.path.join(root, icon_file)
-                        if os.path.exists(potential_icon):
-                            icon_path = potential_icon
-                            break
-                    
                     # Store game info
-                    game_id = f"custom:{file_path}"
-                    self.games[game_id] = {
+                    game_id = f"custom:{entry.path}"
+                    games[game_id] = {
                         'id': game_id,
                         'name': name,
                         'source': 'Custom',
-                        'executable': file_path,
+                        'executable': entry.path,
                         'install_dir': root,
                         'icon': icon_path,
                     }
-                    found_games += 1
         
-        logger.info(f"Found {found_games} custom games")
+        logger.info(f"Found {len(games)} custom games")
+        return games
+    
+    def _walk_files(self, top):
+        """Walk a directory tree with os.scandir.
+        
+        Symlinked directories are not followed, and unreadable directories
+        and those in _SKIPPED_DIRS are skipped.
+        
+        Args:
+            top: Directory to walk
+            
+        Yields:
+            Tuples of (directory path, list of os.DirEntry for its files)
+        """
+        pending = [top]
+        while pending:
+            root = pending.pop()
+            try:
+                with os.scandir(root) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+                
+            files = []
+            subdirs = []
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in _SKIPPED_DIRS:
+                            subdirs.append(entry.path)
+                    elif entry.is_file():
+                        files.append(entry)
+                except OSError:
+                    continue
+                    
+            yield root, files
+            
+            # Visit subdirectories in listing order
+            pending.extend(reversed(subdirs))
     
     def get_all_games(self):
         """Get all discovered games.
@@ -494,7 +980,9 @@ class GameLibrary:
             max_count: Maximum number of games to return
             
         Returns:
-            List of game info dicts, sorted by recency
+            List of game info dicts, sorted by recency. Library entries are
+            returned as-is and must not be modified; use get_last_played()
+            for their launch time.
         """
         # First, get recently launched games from config
         recent_games = self.config.get("games", "recently_launched", [])
@@ -506,10 +994,7 @@ class GameLibrary:
             game_id = recent.get("id")
             if game_id in self.games:
                 # Game still exists, use current metadata
-                game_info = self.games[game_id].copy()
-                # But keep timestamp from recent list
-                game_info["last_played"] = recent.get("last_played", 0)
-                result.append(game_info)
+                result.append(self.games[game_id])
             elif "executable" in recent and os.path.exists(recent["executable"]):
                 # Game not found in library but executable exists
                 result.append(recent)
@@ -517,8 +1002,9 @@ class GameLibrary:
         # If we don't have enough recent games, add more from library
         if len(result) < max_count:
             # Sort remaining games by name
+            result_ids = {r["id"] for r in result}
             other_games = sorted(
-                [g for g in self.games.values() if g["id"] not in [r["id"] for r in result]],
+                (g for g in self.games.values() if g["id"] not in result_ids),
                 key=lambda g: g["name"]
             )
             result.extend(other_games[:max_count - len(result)])
@@ -526,6 +1012,17 @@ class GameLibrary:
         # Ensure we don't exceed max_count
         return result[:max_count]
     
+    def get_last_played(self, game_id):
+        """Get the time a game was last launched.
+        
+        Args:
+            game_id: Game identifier
+            
+        Returns:
+            Unix timestamp, or 0 if the game was never launched
+        """
+        return self._last_played.get(game_id, 0)
+    
     def launch_game(self, game_id, game_info=None):
         """Launch a game.
         
@@ -552,23 +1049,14 @@ class GameLibrary:
         
         try:
             # Different launch methods depending on source
-            if game_id.startswith("steam:"):
-                # Launch via steam URL
-                subprocess.Popen(["xdg-open", executable])
-            elif game_id.startswith("flatpak:"):
-                # Launch via flatpak run
-                subprocess.Popen(executable.split())
-            elif game_id.startswith("lutris:"):
-                # Launch via lutris command
-                subprocess.Popen(executable.split())
-            else:
-                # Direct executable
-                subprocess.Popen([executable])
+            source = game_id.partition(":")[0]
+            launch = self._launchers.get(source, self._launch_direct)
+            launch(executable, game_info)
             
             # Update last played time
             now = int(time.time())
-            if game_id in self.games:
-                self.games[game_id]["last_played"] = now
+            self._last_played[game_id] = now
+            self.version += 1
             
             # Update recently launched games list
             self.config.update_recently_launched(game_id, {
@@ -584,6 +1072,22 @@ class GameLibrary:
             logger.error(f"Error launching game {game_id}: {str(e)}")
             return False
     
+    def _launch_url(self, executable, game_info):
+        """Launch a game through its URL, e.g. steam://rungameid/<id>."""
+        subprocess.Popen(["xdg-open", executable])
+    
+    def _launch_command(self, executable, game_info):
+        """Launch a game through a launcher command such as flatpak run.
+        
+        Uses the argument list stored at scan time, splitting the
+        executable string only for entries that lack one.
+        """
+        subprocess.Popen(game_info.get("argv") or executable.split())
+    
+    def _launch_direct(self, executable, game_info):
+        """Launch a game by running its executable directly."""
+        subprocess.Popen([executable])
+    
     def remove_game(self, game_id):
         """Remove a game from the library and recent list.
         
@@ -596,16 +1100,11 @@ class GameLibrary:
         # Remove from games dict
         if game_id in self.games:
             del self.games[game_id]
+        self._last_played.pop(game_id, None)
+        self.version += 1
         
         # Remove from recently launched list
-        recently = self.config.get("games", "recently_launched", [])
-        updated = [g for g in recently if g.get("id") != game_id]
-        
-        if len(updated) != len(recently):
-            self.config.set("games", "recently_launched", updated)
-            return True
-        
-        return False
+        return self.config.remove_recently_launched(game_id)
 
 # For direct testing
 if __name__ == "__main__":
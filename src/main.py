@@ -72,6 +72,8 @@ class ControllerLaunch:
         logger.info("Starting ControllerLaunch")
         self.overlay.show_all()
         Gtk.main()
+        # Write any debounced configuration changes before exiting
+        self.config.flush()
 
 def main():
     """Application entry point."""
@@ -3,19 +3,54 @@
 
 import os
 import gi
+import stat
+import queue
 import logging
+import functools
 import threading
 import time
 from datetime import datetime
 
 gi.require_version('Gtk', '3.0')
-from gi.repository import Gtk, Gdk, GdkPixbuf, GLib, Pango
+gi.require_version('PangoCairo', '1.0')
+from gi.repository import Gtk, Gdk, GdkPixbuf, GLib, Pango, PangoCairo
 import cairo
 
 import pygame
 
 logger = logging.getLogger('controller-launch.ui')
 
+@functools.lru_cache(maxsize=256)
+def _load_scaled_pixbuf(path, mtime_ns, width, height):
+    """Load an image scaled to fit the given size.
+    
+    Results are cached; the modification time is part of the key so an
+    updated file is decoded again. Pixbufs are immutable and can be shared
+    between images.
+    """
+    return GdkPixbuf.Pixbuf.new_from_file_at_scale(path, width, height, True)
+
+@functools.lru_cache(maxsize=None)
+def _render_letter_pixbuf(letter, width, height):
+    """Render a letter centered on a transparent pixbuf.
+    
+    Used as the fallback game icon; rendered once per letter and size so
+    the text is only laid out once.
+    """
+    surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, width, height)
+    cr = cairo.Context(surface)
+    
+    layout = PangoCairo.create_layout(cr)
+    layout.set_font_description(Pango.FontDescription("Bold 32"))
+    layout.set_text(letter, -1)
+    text_width, text_height = layout.get_pixel_size()
+    
+    cr.set_source_rgb(1, 1, 1)
+    cr.move_to((width - text_width) / 2, (height - text_height) / 2)
+    PangoCairo.show_layout(cr, layout)
+    
+    return Gdk.pixbuf_get_from_surface(surface, 0, 0, width, height)
+
 class OverlayWindow(Gtk.Window):
     """Main overlay window for game selection."""
     
@@ -25,6 +60,16 @@ class OverlayWindow(Gtk.Window):
     CELL_WIDTH = 180  # Width of each grid cell
     CELL_HEIGHT = 180  # Height of each grid cell
     SELECTION_BORDER_WIDTH = 4  # Width of selection border
+    EVENT_WAIT_TIMEOUT = 250  # Max ms to block waiting for controller events
+    AXIS_PRESS_THRESHOLD = 0.5  # Stick deflection that triggers a move
+    AXIS_RELEASE_THRESHOLD = 0.3  # Stick must return below this to trigger again
+    AXIS_DEADZONE = 0.2  # Stick noise below this is dropped as soon as it arrives
+    ICON_BATCH_SIZE = 8  # Decoded icons attached to the grid per main loop tick
+    
+    # Controller button index -> action. The south face button confirms on
+    # most controllers; Nintendo layouts confirm with the east button (A).
+    BUTTON_MAP = {0: 'confirm', 1: 'back', 4: 'previous_page', 5: 'next_page'}
+    NINTENDO_BUTTON_MAP = {1: 'confirm', 0: 'back', 4: 'previous_page', 5: 'next_page'}
     
     def __init__(self, game_library, config_manager):
         """Initialize the overlay window.
@@ -38,9 +83,36 @@ class OverlayWindow(Gtk.Window):
         self.config = config_manager
         self.controller_monitor_thread = None
         self.running = False
-        self.game_grid_items = []
+        # Grid items as parallel lists indexed by grid position
+        self._item_frames = []
+        self._item_ids = []
+        self._item_data = []
+        self._grid_shape = (0, 0)  # (last row, last column of the last row)
+        self._loaded_version = None  # Library and config versions shown in the grid
         self.current_selection = (0, 0)  # (row, column)
+        self._selected_index = 0
+        
+        # Icons are decoded on a worker thread and attached from the main loop
+        self._icon_queue = queue.Queue()
+        self._icon_generation = 0
+        self._icon_thread = None
+        self._icon_drain_id = None
         self.current_page = 0
+        self._axis_state = {}  # (instance ID, axis) -> last triggered sign
+        
+        # Moves waiting for the main loop, drained by a single idle callback
+        self._move_lock = threading.Lock()
+        self._pending_moves = {}
+        self._move_drain_scheduled = False
+        
+        # Controller actions and moves from events popped before this time
+        # are stale
+        self._input_gate = 0.0
+        
+        # Dialog answered by the controller while it is open, and when it
+        # was opened; earlier input is not routed to it
+        self._dialog = None
+        self._dialog_opened_at = 0.0
         
         # Initialize controller handling
         self._init_pygame()
@@ -64,18 +136,70 @@ class OverlayWindow(Gtk.Window):
             pygame.init()
         if not pygame.joystick.get_init():
             pygame.joystick.init()
+            
+        # Only queue the events the monitor thread handles; SDL drops the
+        # rest before they are turned into Python objects
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed([
+            pygame.JOYBUTTONDOWN,
+            pygame.JOYHATMOTION,
+            pygame.JOYAXISMOTION,
+            pygame.JOYDEVICEADDED,
+            pygame.JOYDEVICEREMOVED,
+            pygame.USEREVENT,  # Posted to wake the monitor thread on stop
+        ])
         
-        # Initialize all connected controllers
-        self.controllers = []
+        # Initialize all connected controllers, keyed by instance ID. Names
+        # are cached so the status label never has to query SDL.
+        self.controllers = {}
+        self._joystick_names = {}
+        self._button_maps = {}
         joystick_count = pygame.joystick.get_count()
         for i in range(joystick_count):
-            try:
-                joystick = pygame.joystick.Joystick(i)
-                joystick.init()
-                self.controllers.append(joystick)
-                logger.info(f"Initialized controller: {joystick.get_name()}")
-            except Exception as e:
-                logger.error(f"Failed to initialize joystick {i}: {str(e)}")
+            self._add_controller(i)
+    
+    def _add_controller(self, device_index):
+        """Open a controller and record its name.
+        
+        Args:
+            device_index: pygame device index of the controller
+        """
+        try:
+            joystick = pygame.joystick.Joystick(device_index)
+            joystick.init()
+            instance_id = joystick.get_instance_id()
+            self.controllers[instance_id] = joystick
+            self._joystick_names[instance_id] = joystick.get_name()
+            self._button_maps[instance_id] = self._get_button_map(joystick.get_name())
+            logger.info(f"Initialized controller: {joystick.get_name()}")
+        except Exception as e:
+            logger.error(f"Failed to initialize joystick {device_index}: {str(e)}")
+    
+    def _get_button_map(self, name):
+        """Get the button mapping for a controller.
+        
+        Args:
+            name: Controller name as reported by pygame
+            
+        Returns:
+            Dict of button index -> action name
+        """
+        lowered = name.lower()
+        if 'nintendo' in lowered or 'pro controller' in lowered:
+            return self.NINTENDO_BUTTON_MAP
+        return self.BUTTON_MAP
+    
+    def _remove_controller(self, instance_id):
+        """Forget a disconnected controller.
+        
+        Args:
+            instance_id: pygame instance ID of the controller
+        """
+        self.controllers.pop(instance_id, None)
+        self._button_maps.pop(instance_id, None)
+        name = self._joystick_names.pop(instance_id, None)
+        if name is not None:
+            logger.info(f"Controller disconnected: {name}")
     
     def _setup_window(self):
         """Set up window properties."""
@@ -109,10 +233,45 @@ class OverlayWindow(Gtk.Window):
         self.connect("key-press-event", self.on_key_press)
         self.connect("draw", self.on_draw)
         
-        # Set opacity
-        opacity = self.config.get("ui", "opacity", 0.9)
+        # Style used to highlight the selected game
+        self._load_css()
+        
+        # Set opacity; the background color is computed here for on_draw
+        self._apply_opacity()
+    
+    def _apply_opacity(self):
+        """Apply the configured opacity and refresh the background color."""
+        opacity = float(self.config.get("ui", "opacity", 0.9))
+        self._bg_rgba = (0.1, 0.1, 0.1, opacity)
+        self._opacity_revision = getattr(self.config, 'revision', 0)
         self.set_opacity(opacity)
     
+    def _load_css(self):
+        """Install the CSS used for game items.
+        
+        Every item reserves a transparent border, so selecting one only
+        changes the border color and never triggers a relayout.
+        """
+        css = f"""
+        .game-item {{
+            border: {self.SELECTION_BORDER_WIDTH}px solid transparent;
+            border-radius: 6px;
+        }}
+        flowboxchild:selected {{
+            background-color: transparent;
+        }}
+        flowboxchild:selected .game-item {{
+            border-color: #33aaff;
+        }}
+        """
+        provider = Gtk.CssProvider()
+        provider.load_from_data(css.encode('utf-8'))
+        Gtk.StyleContext.add_provider_for_screen(
+            self.get_screen(),
+            provider,
+            Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION
+        )
+    
     def _create_ui(self):
         """Create the UI elements."""
         # Main container
@@ -145,7 +304,16 @@ class OverlayWindow(Gtk.Window):
         self.grid_scroll = Gtk.ScrolledWindow()
         self.grid_scroll.set_policy(Gtk.PolicyType.NEVER, Gtk.PolicyType.AUTOMATIC)
         
-        self.game_grid = Gtk.Grid()
+        # FlowBox keeps track of selection; a fixed number of columns keeps
+        # row/column math in sync with it. A single click only selects, as
+        # before, and arrow keys are handled in on_key_press so they wrap.
+        self.game_grid = Gtk.FlowBox()
+        self.game_grid.set_selection_mode(Gtk.SelectionMode.SINGLE)
+        self.game_grid.set_activate_on_single_click(False)
+        self.game_grid.set_min_children_per_line(self.GRID_COLUMNS)
+        self.game_grid.set_max_children_per_line(self.GRID_COLUMNS)
+        self.game_grid.set_homogeneous(True)
+        self.game_grid.set_valign(Gtk.Align.START)
         self.game_grid.set_row_spacing(10)
         self.game_grid.set_column_spacing(10)
         self.game_grid.set_margin_start(20)
@@ -153,6 +321,9 @@ class OverlayWindow(Gtk.Window):
         self.game_grid.set_margin_top(10)
         self.game_grid.set_margin_bottom(20)
         
+        self.game_grid.set_vadjustment(self.grid_scroll.get_vadjustment())
+        self.game_grid.connect("selected-children-changed", self.on_selection_changed)
+        self.game_grid.connect("child-activated", lambda flowbox, child: self._select_current())
         self.grid_scroll.add(self.game_grid)
         self.main_box.pack_start(self.grid_scroll, True, True, 0)
         
@@ -171,11 +342,19 @@ class OverlayWindow(Gtk.Window):
     
     def _load_games(self):
         """Load games into the grid."""
+        # Remember the selected game so it stays selected after the reload
+        selected_id = None
+        if self._selected_index < len(self._item_ids):
+            selected_id = self._item_ids[self._selected_index]
+        
         # Clear existing grid
         for child in self.game_grid.get_children():
             self.game_grid.remove(child)
         
-        self.game_grid_items = []
+        self._item_frames = []
+        self._item_ids = []
+        self._item_data = []
+        self._loaded_version = self._data_version()
         
         # Get games from library
         games = self.game_library.get_recent_games(
@@ -183,11 +362,13 @@ class OverlayWindow(Gtk.Window):
         )
         
         # Set up grid items
-        row, col = 0, 0
+        icon_size = (self.CELL_WIDTH - 60, self.CELL_HEIGHT - 100)
+        icon_jobs = []
         for i, game in enumerate(games):
             # Create game item frame (with border for selection highlighting)
             frame = Gtk.Frame()
             frame.set_shadow_type(Gtk.ShadowType.NONE)
+            frame.get_style_context().add_class("game-item")
             
             # Container for game info
             game_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=5)
@@ -200,27 +381,15 @@ class OverlayWindow(Gtk.Window):
             icon_box = Gtk.Box()
             icon_box.set_size_request(self.CELL_WIDTH - 40, self.CELL_HEIGHT - 80)
             
-            if game.get('icon') and os.path.isfile(game['icon']):
-                try:
-                    pixbuf = GdkPixbuf.Pixbuf.new_from_file_at_scale(
-                        game['icon'], 
-                        self.CELL_WIDTH - 60, 
-                        self.CELL_HEIGHT - 100, 
-                        True
-                    )
-                    image = Gtk.Image.new_from_pixbuf(pixbuf)
-                    icon_box.pack_start(image, True, True, 0)
-                except Exception as e:
-                    logger.error(f"Error loading game icon: {e}")
-                    # Fallback to text label
-                    label = Gtk.Label(label=game['name'][0].upper())
-                    label.set_markup(f"<span font='32' weight='bold'>{game['name'][0].upper()}</span>")
-                    icon_box.pack_start(label, True, True, 0)
+            icon_path = game.get('icon')
+            if icon_path:
+                # Placeholder filled in once the icon is decoded
+                image = Gtk.Image()
+                icon_box.pack_start(image, True, True, 0)
+                icon_jobs.append((i, icon_path, icon_size))
             else:
                 # Use first letter as icon
-                label = Gtk.Label(label=game['name'][0].upper())
-                label.set_markup(f"<span font='32' weight='bold'>{game['name'][0].upper()}</span>")
-                icon_box.pack_start(label, True, True, 0)
+                icon_box.pack_start(self._create_letter_icon(game['name']), True, True, 0)
             
             game_box.pack_start(icon_box, True, True, 0)
             
@@ -241,31 +410,132 @@ class OverlayWindow(Gtk.Window):
             frame.add(game_box)
             
             # Store for later access
-            self.game_grid_items.append({
-                'frame': frame,
-                'game_id': game.get('id', str(i)),
-                'game_data': game
-            })
+            self._item_frames.append(frame)
+            self._item_ids.append(game.get('id', str(i)))
+            self._item_data.append(game)
             
-            # Add to grid
-            self.game_grid.attach(frame, col, row, 1, 1)
-            
-            # Next position
-            col += 1
-            if col >= self.GRID_COLUMNS:
-                col = 0
-                row += 1
+            # Add to grid; only the new item's widgets need showing, the
+            # FlowBox shows the child it wraps them in
+            frame.show_all()
+            self.game_grid.add(frame)
+        
+        # Decode icons in the background; results of earlier loads are dropped
+        self._icon_generation += 1
+        if icon_jobs:
+            self._icon_thread = threading.Thread(
+                target=self._decode_icons,
+                args=(self._icon_generation, icon_jobs),
+                daemon=True
+            )
+            self._icon_thread.start()
+            if self._icon_drain_id is None:
+                self._icon_drain_id = GLib.timeout_add(16, self._drain_icon_queue)
+        elif self._icon_drain_id is not None:
+            # Nothing to decode; let the running drain stop
+            self._icon_queue.put((self._icon_generation, None, None))
         
-        # Show everything
-        self.game_grid.show_all()
+        # Precompute the grid bounds used when moving the selection
+        last_index = len(self._item_frames) - 1
+        self._grid_shape = divmod(last_index, self.GRID_COLUMNS) if last_index >= 0 else (0, 0)
         
-        # Set initial selection
-        if self.game_grid_items:
-            self._set_selection(0, 0)
+        # Keep the previously selected game selected wherever it moved to;
+        # if it is gone, keep the old position, clamped to the new grid
+        index = 0
+        if self._item_frames:
+            if selected_id in self._item_ids:
+                index = self._item_ids.index(selected_id)
+            else:
+                index = min(self._selected_index, last_index)
+        self.current_selection = divmod(index, self.GRID_COLUMNS)
+        if self._item_frames:
+            self._set_selection(*self.current_selection)
         
         # Update controller status
         self._update_controller_status()
     
+    def _data_version(self):
+        """Get the versions of the data shown in the grid.
+        
+        Returns:
+            Tuple of the game library version and the config revision
+        """
+        return (getattr(self.game_library, 'version', 0), getattr(self.config, 'revision', 0))
+    
+    def _create_letter_icon(self, name):
+        """Create the fallback icon showing the first letter of a game name."""
+        pixbuf = _render_letter_pixbuf(
+            name[0].upper(),
+            self.CELL_WIDTH - 60,
+            self.CELL_HEIGHT - 100
+        )
+        return Gtk.Image.new_from_pixbuf(pixbuf)
+    
+    def _decode_icons(self, generation, jobs):
+        """Decode game icons on a worker thread.
+        
+        Only file IO and pixbuf decoding happen here; results are queued
+        for _drain_icon_queue() to attach on the main loop, followed by an
+        end-of-generation marker with no index. No widgets are referenced
+        from this thread, so none can be finalized off the main loop.
+        
+        Args:
+            generation: Value of _icon_generation when the jobs were created
+            jobs: List of (grid index, icon path, (width, height))
+        """
+        for index, icon_path, (width, height) in jobs:
+            # Stop early if the grid has been reloaded meanwhile
+            if generation != self._icon_generation:
+                break
+                
+            pixbuf = None
+            try:
+                icon_stat = os.stat(icon_path)
+                if stat.S_ISREG(icon_stat.st_mode):
+                    pixbuf = _load_scaled_pixbuf(icon_path, icon_stat.st_mtime_ns, width, height)
+            except OSError:
+                pass
+            except Exception as e:
+                logger.error(f"Error loading game icon: {e}")
+                
+            self._icon_queue.put((generation, index, pixbuf))
+            
+        self._icon_queue.put((generation, None, None))
+    
+    def _drain_icon_queue(self):
+        """Attach a batch of decoded icons to the grid.
+        
+        Returns:
+            True while icons are still pending, False to stop the timeout
+        """
+        for _ in range(self.ICON_BATCH_SIZE):
+            try:
+                generation, index, pixbuf = self._icon_queue.get_nowait()
+            except queue.Empty:
+                break
+                
+            if generation != self._icon_generation:
+                continue
+                
+            if index is None:
+                # The current load's icons have all been attached
+                self._icon_drain_id = None
+                return False
+                
+            if pixbuf is None:
+                # Fall back to the first letter if the icon is unusable
+                pixbuf = _render_letter_pixbuf(
+                    self._item_data[index]['name'][0].upper(),
+                    self.CELL_WIDTH - 60,
+                    self.CELL_HEIGHT - 100
+                )
+            
+            # frame -> game box -> icon box -> placeholder image
+            game_box = self._item_frames[index].get_child()
+            icon_box = game_box.get_children()[0]
+            icon_box.get_children()[0].set_from_pixbuf(pixbuf)
+        
+        return True
+    
     def _set_selection(self, row, col):
         """Set the current selection in the grid.
         
@@ -273,47 +543,38 @@ class OverlayWindow(Gtk.Window):
             row: Row index
             col: Column index
         """
-        # Validate selection
-        max_row = (len(self.game_grid_items) - 1) // self.GRID_COLUMNS
-        max_col = min(self.GRID_COLUMNS - 1, len(self.game_grid_items) - 1 - row * self.GRID_COLUMNS)
-        
+        if not self._item_frames:
+            return
+            
+        # Validate selection, wrapping around the edges of the grid
+        max_row, last_row_max_col = self._grid_shape
         if row < 0:
             row = max_row
         elif row > max_row:
             row = 0
             
+        max_col = last_row_max_col if row == max_row else self.GRID_COLUMNS - 1
         if col < 0:
             col = max_col
         elif col > max_col:
             col = 0
         
-        # Calculate index
         index = row * self.GRID_COLUMNS + col
-        if index >= len(self.game_grid_items):
-            # Adjust if out of bounds
-            row = 0
-            col = 0
-            index = 0
-        
-        # Clear previous selection
-        prev_row, prev_col = self.current_selection
-        prev_index = prev_row * self.GRID_COLUMNS + prev_col
-        if 0 <= prev_index < len(self.game_grid_items):
-            prev_frame = self.game_grid_items[prev_index]['frame']
-            prev_frame.set_shadow_type(Gtk.ShadowType.NONE)
-        
-        # Set new selection
-        if index < len(self.game_grid_items):
-            self.current_selection = (row, col)
-            frame = self.game_grid_items[index]['frame']
-            frame.set_shadow_type(Gtk.ShadowType.OUT)
-            
-            # Scroll to ensure visibility
-            child = frame.get_child()
-            adjustment = self.grid_scroll.get_vadjustment()
-            if adjustment:
-                alloc = child.get_allocation()
-                adjustment.set_value(alloc.y - 10)
+        
+        # Select and focus the item; focusing it scrolls it into view and
+        # lets keyboard navigation continue from there
+        self.current_selection = (row, col)
+        self._selected_index = index
+        child = self.game_grid.get_child_at_index(index)
+        self.game_grid.select_child(child)
+        child.grab_focus()
+    
+    def on_selection_changed(self, flowbox):
+        """Track selection changes, including keyboard navigation."""
+        selected = flowbox.get_selected_children()
+        if selected:
+            self._selected_index = selected[0].get_index()
+            self.current_selection = divmod(self._selected_index, self.GRID_COLUMNS)
     
     def _move_selection(self, direction):
         """Move the selection in the specified direction.
@@ -334,12 +595,11 @@ class OverlayWindow(Gtk.Window):
     
     def _select_current(self):
         """Launch the currently selected game."""
-        row, col = self.current_selection
-        index = row * self.GRID_COLUMNS + col
+        index = self._selected_index
         
-        if 0 <= index < len(self.game_grid_items):
-            game_data = self.game_grid_items[index]['game_data']
-            game_id = self.game_grid_items[index]['game_id']
+        if index < len(self._item_ids):
+            game_data = self._item_data[index]
+            game_id = self._item_ids[index]
             
             logger.info(f"Launching game: {game_data['name']}")
             success = self.game_library.launch_game(game_id, game_data)
@@ -370,7 +630,17 @@ class OverlayWindow(Gtk.Window):
                 # Set default to No
                 dialog.set_default_response(Gtk.ResponseType.NO)
                 
-                response = dialog.run()
+                # Grid actions are dropped while the dialog is open, since they
+                # would otherwise run inside its nested main loop. Confirm and
+                # Back answer the dialog instead.
+                self._input_gate = float('inf')
+                self._dialog = dialog
+                self._dialog_opened_at = time.monotonic()
+                try:
+                    response = dialog.run()
+                finally:
+                    self._dialog = None
+                    self._input_gate = time.monotonic()
                 if response == Gtk.ResponseType.YES:
                     # Remove game from library
                     self.game_library.remove_game(game_id)
@@ -394,24 +664,25 @@ class OverlayWindow(Gtk.Window):
             
         return False
     
+    def _confirm_dialog(self):
+        """Activate the focused button of the open dialog."""
+        focus = self._dialog.get_focus()
+        if isinstance(focus, Gtk.Button):
+            focus.clicked()
+        else:
+            self._dialog.response(Gtk.ResponseType.NO)
+    
+    def _cancel_dialog(self):
+        """Close the open dialog without removing the game."""
+        self._dialog.response(Gtk.ResponseType.CANCEL)
+    
     def _update_controller_status(self):
-        """Update the controller status label."""
-        pygame.joystick.init()  # Make sure it's initialized
-        joystick_count = pygame.joystick.get_count()
+        """Update the controller status label from the cached controller names."""
+        joystick_count = len(self._joystick_names)
         
         if joystick_count == 0:
             self.controller_status.set_markup("<span foreground='red'>No controllers</span>")
         else:
-            controller_names = []
-            for i in range(joystick_count):
-                try:
-                    joystick = pygame.joystick.Joystick(i)
-                    if not joystick.get_init():
-                        joystick.init()
-                    controller_names.append(joystick.get_name())
-                except Exception:
-                    controller_names.append(f"Controller {i+1}")
-            
             self.controller_status.set_markup(
                 f"<span foreground='green'>{joystick_count} Controller{'s' if joystick_count > 1 else ''}</span>"
             )
@@ -432,6 +703,12 @@ class OverlayWindow(Gtk.Window):
         """Stop the controller input monitoring thread."""
         self.running = False
         if self.controller_monitor_thread:
+            # Wake the thread from pygame.event.wait so the join below does
+            # not block the main loop for the rest of the wait timeout
+            try:
+                pygame.event.post(pygame.event.Event(pygame.USEREVENT))
+            except pygame.error as e:
+                logger.debug(f"Could not wake controller monitor: {str(e)}")
             self.controller_monitor_thread.join(timeout=1.0)
             self.controller_monitor_thread = None
     
@@ -439,69 +716,215 @@ class OverlayWindow(Gtk.Window):
         """Monitor controller input in a separate thread."""
         while self.running:
             try:
-                # Process pygame events
+                # Block until an event arrives instead of polling; the timeout
+                # lets the loop notice when it is stopped
+                event = pygame.event.wait(self.EVENT_WAIT_TIMEOUT)
+                if event.type in (pygame.NOEVENT, pygame.USEREVENT) or self._is_axis_noise(event):
+                    continue
+                    
+                # Process it along with any events that arrived alongside it.
+                # Motion is folded into at most one move per axis so a burst
+                # of events does not queue up moves that overshoot.
+                popped_at = time.monotonic()
+                moves = {}
+                self._process_event(event, moves, popped_at)
                 for event in pygame.event.get():
-                    if event.type == pygame.JOYBUTTONDOWN:
-                        # Handle button press
-                        self._handle_controller_button(event.button)
-                    elif event.type == pygame.JOYHATMOTION:
-                        # Handle D-pad
-                        x, y = event.value
-                        if x > 0:
-                            GLib.idle_add(self._move_selection, 'right')
-                        elif x < 0:
-                            GLib.idle_add(self._move_selection, 'left')
-                        if y > 0:
-                            GLib.idle_add(self._move_selection, 'up')
-                        elif y < 0:
-                            GLib.idle_add(self._move_selection, 'down')
-                    elif event.type == pygame.JOYAXISMOTION:
-                        # Handle analog stick
-                        if event.axis in [0, 2]:  # X-axis
-                            if event.value > 0.5:
-                                GLib.idle_add(self._move_selection, 'right')
-                            elif event.value < -0.5:
-                                GLib.idle_add(self._move_selection, 'left')
-                        elif event.type in [1, 3]:  # Y-axis
-                            if event.value > 0.5:
-                                GLib.idle_add(self._move_selection, 'down')
-                            elif event.value < -0.5:
-                                GLib.idle_add(self._move_selection, 'up')
-                    elif event.type == pygame.JOYDEVICEADDED:
-                        # Controller connected
-                        GLib.idle_add(self._update_controller_status)
-                    elif event.type == pygame.JOYDEVICEREMOVED:
-                        # Controller disconnected
-                        GLib.idle_add(self._update_controller_status)
+                    if not self._is_axis_noise(event):
+                        self._process_event(event, moves, popped_at)
+                    
+                if moves:
+                    self._post_moves(moves, popped_at)
             except Exception as e:
                 logger.error(f"Error in controller monitor: {str(e)}")
-                
-            # Sleep briefly to avoid high CPU usage
-            time.sleep(0.05)
     
-    def _handle_controller_button(self, button):
+    def _post_moves(self, moves, popped_at):
+        """Hand moves to the main loop.
+        
+        Newer moves replace pending ones on the same axis, and at most one
+        idle callback is scheduled at a time, so a busy controller cannot
+        flood the main loop with stale moves.
+        
+        Args:
+            moves: Dict of 'x'/'y' -> direction
+            popped_at: time.monotonic() when the events were taken off the queue
+        """
+        with self._move_lock:
+            for axis, direction in moves.items():
+                self._pending_moves[axis] = (direction, popped_at)
+            if self._move_drain_scheduled:
+                return
+            self._move_drain_scheduled = True
+        GLib.idle_add(self._drain_moves)
+    
+    def _drain_moves(self):
+        """Apply the pending moves on the main loop."""
+        with self._move_lock:
+            moves = self._pending_moves
+            self._pending_moves = {}
+            self._move_drain_scheduled = False
+            
+        for direction, popped_at in moves.values():
+            if self._dialog is not None:
+                # Left/right move between the open dialog's buttons
+                if popped_at >= self._dialog_opened_at and direction in ('left', 'right'):
+                    self._dialog.child_focus(
+                        Gtk.DirectionType.LEFT if direction == 'left' else Gtk.DirectionType.RIGHT
+                    )
+            elif self._input_allowed(popped_at):
+                self._move_selection(direction)
+        return False
+    
+    def _process_event(self, event, moves, popped_at):
+        """Process a single pygame event.
+        
+        Args:
+            event: pygame event
+            moves: Dict of 'x'/'y' -> latest direction, updated by motion events
+            popped_at: time.monotonic() when the event was taken off the queue
+        """
+        if event.type == pygame.JOYBUTTONDOWN:
+            # Handle button press
+            self._handle_controller_button(event.instance_id, event.button, popped_at)
+        elif event.type == pygame.JOYHATMOTION:
+            # Handle D-pad
+            x, y = event.value
+            if x > 0:
+                moves['x'] = 'right'
+            elif x < 0:
+                moves['x'] = 'left'
+            if y > 0:
+                moves['y'] = 'up'
+            elif y < 0:
+                moves['y'] = 'down'
+        elif event.type == pygame.JOYAXISMOTION:
+            # Handle analog stick
+            sign = self._axis_triggered(event.instance_id, event.axis, event.value)
+            if event.axis in [0, 2]:  # X-axis
+                if sign > 0:
+                    moves['x'] = 'right'
+                elif sign < 0:
+                    moves['x'] = 'left'
+            elif event.axis in [1, 3]:  # Y-axis
+                if sign > 0:
+                    moves['y'] = 'down'
+                elif sign < 0:
+                    moves['y'] = 'up'
+        elif event.type == pygame.JOYDEVICEADDED:
+            # Controller connected
+            self._add_controller(event.device_index)
+            GLib.idle_add(self._update_controller_status)
+        elif event.type == pygame.JOYDEVICEREMOVED:
+            # Controller disconnected
+            self._remove_controller(event.instance_id)
+            GLib.idle_add(self._update_controller_status)
+    
+    def _is_axis_noise(self, event):
+        """Check whether an event is stick jitter around the rest position.
+        
+        Small values still count as a release for an axis that has
+        triggered, so those are not treated as noise.
+        
+        Args:
+            event: pygame event
+            
+        Returns:
+            True if the event can be dropped without processing
+        """
+        return (
+            event.type == pygame.JOYAXISMOTION
+            and abs(event.value) < self.AXIS_DEADZONE
+            and (event.instance_id, event.axis) not in self._axis_state
+        )
+    
+    def _axis_triggered(self, instance_id, axis, value):
+        """Edge-trigger an analog axis with hysteresis.
+        
+        An axis triggers once when pushed past AXIS_PRESS_THRESHOLD and has to
+        return below AXIS_RELEASE_THRESHOLD before it can trigger again.
+        
+        Args:
+            instance_id: pygame instance ID of the controller
+            axis: Axis index
+            value: Axis value between -1 and 1
+            
+        Returns:
+            1 or -1 if the axis just triggered in that direction, 0 otherwise
+        """
+        key = (instance_id, axis)
+        if abs(value) < self.AXIS_RELEASE_THRESHOLD:
+            self._axis_state.pop(key, None)
+            return 0
+        if abs(value) <= self.AXIS_PRESS_THRESHOLD:
+            return 0
+            
+        sign = 1 if value > 0 else -1
+        if self._axis_state.get(key) == sign:
+            return 0
+        self._axis_state[key] = sign
+        return sign
+    
+    def _handle_controller_button(self, instance_id, button, popped_at):
         """Handle controller button press.
         
         Args:
+            instance_id: pygame instance ID of the controller
             button: Button index
+            popped_at: time.monotonic() when the event was taken off the queue
         """
-        # Common button mappings
-        # Note: These may vary by controller type
-        if button in [0, 1]:  # A/X button (confirm)
-            GLib.idle_add(self._select_current)
-        elif button in [1, 2]:  # B/Circle button (back/cancel)
-            GLib.idle_add(self.hide)
-        elif button in [4, 6]:  # LB/L1 button
+        # Buttons are mapped per controller when it is added
+        action = self._button_maps.get(instance_id, self.BUTTON_MAP).get(button)
+        if action == 'confirm':  # A/Cross button
+            GLib.idle_add(self._run_controller_action, self._select_current, self._confirm_dialog, popped_at)
+        elif action == 'back':  # B/Circle button
+            GLib.idle_add(self._run_controller_action, self.hide, self._cancel_dialog, popped_at)
+        elif action == 'previous_page':  # LB/L1 button
             pass  # TODO: Previous page
-        elif button in [5, 7]:  # RB/R1 button
+        elif action == 'next_page':  # RB/R1 button
             pass  # TODO: Next page
     
+    def _run_controller_action(self, action, dialog_action, popped_at):
+        """Run a controller action on the main loop unless it is stale.
+        
+        While a dialog is open, presses made after it opened answer the
+        dialog instead. Grid actions queued before or while it is open are
+        dropped, so a press cannot fire again behind or right after it.
+        
+        Args:
+            action: Callable to run on the grid
+            dialog_action: Callable to run instead while a dialog is open
+            popped_at: time.monotonic() when the triggering event was popped
+        """
+        if self._dialog is not None:
+            if popped_at >= self._dialog_opened_at:
+                dialog_action()
+        elif self._input_allowed(popped_at):
+            action()
+        return False
+    
+    def _input_allowed(self, popped_at):
+        """Check whether controller input is recent enough to act on.
+        
+        Args:
+            popped_at: time.monotonic() when the triggering event was popped
+            
+        Returns:
+            False if the input arrived before or while a dialog was open
+        """
+        return popped_at >= self._input_gate
+    
     def on_draw(self, widget, cr):
         """Draw the window background with semi-transparency."""
-        cr.set_source_rgba(0.1, 0.1, 0.1, self.config.get("ui", "opacity", 0.9))
+        # Replace (rather than blend onto) the damaged region; save/restore
+        # hands the context back to GTK with its own source and operator
+        cr.save()
         cr.set_operator(cairo.OPERATOR_SOURCE)
-        cr.paint()
-        cr.set_operator(cairo.OPERATOR_OVER)
+        cr.set_source_rgba(*self._bg_rgba)
+        
+        # Only fill the region GTK asked us to redraw
+        x1, y1, x2, y2 = cr.clip_extents()
+        cr.rectangle(x1, y1, x2 - x1, y2 - y1)
+        cr.fill()
+        cr.restore()
         return False
     
     def on_key_press(self, widget, event):
@@ -541,9 +964,18 @@ class OverlayWindow(Gtk.Window):
     
     def do_show(self):
         """Override the show method to restart controller monitor."""
-        self._init_pygame()  # Re-init pygame
+        # pygame was set up in __init__ and hotplug events keep the
+        # controller list current, so only the monitor needs restarting
         self._update_controller_status()
-        self._load_games()  # Reload games in case library has changed
+        
+        # Pick up an opacity changed in the preferences
+        if getattr(self.config, 'revision', 0) != self._opacity_revision:
+            self._apply_opacity()
+        
+        # Reload games only if the library or the settings (recents, max
+        # games shown) have changed since the last load
+        if self._data_version() != self._loaded_version:
+            self._load_games()
         self._start_controller_monitor()
         Gtk.Window.do_show(self)
 
@@ -3,19 +3,69 @@
 
 import os
 import gi
+import time
 import logging
-import subprocess
+import functools
+import itertools
+import threading
 
 gi.require_version('Gtk', '3.0')
-from gi.repository import Gtk, Gdk, GLib, Pango
+from gi.repository import Gtk, Gio, GLib, Pango
 
 from controller_daemon import ControllerDaemon
 
 logger = logging.getLogger('controller-launch.preferences')
 
+@functools.lru_cache(maxsize=None)
+def _parse_markup(markup):
+    """Parse label markup once and return its (Pango.AttrList, text)."""
+    _, attrs, text, _ = Pango.parse_markup(markup, -1, '\0')
+    return attrs, text
+
 class PreferencesWindow(Gtk.Window):
     """Preferences window for ControllerLaunch."""
     
+    # Delay in milliseconds used to coalesce repeated refresh requests
+    REFRESH_DELAY = 250
+    
+    # Seconds a systemctl is-active result is reused before asking again
+    STATUS_CACHE_TTL = 2.0
+    
+    # Seconds detected controllers are reused when the Controllers tab is
+    # built again, e.g. after the window was closed and reopened
+    CONTROLLER_CACHE_TTL = 10.0
+    
+    # Controllers added to the list per main loop iteration
+    CONTROLLER_BATCH_SIZE = 4
+    
+    # Last controller detection, shared by all preferences windows
+    _detected_controllers = None
+    _detected_controllers_time = 0.0
+    
+    # Game path lists: (config key, label, default paths)
+    PATH_LISTS = (
+        ("steam", "Steam Paths:", ("~/.steam", "~/.local/share/Steam")),
+        ("flatpak", "Flatpak Paths:", ("/var/lib/flatpak/app",)),
+        ("lutris", "Lutris Paths:", ("~/.local/share/lutris",)),
+        ("custom", "Custom Game Paths:", ()),
+    )
+    
+    # Controller types with configurable buttons: (config key, heading)
+    CONTROLLER_TYPES = (
+        ("xbox", "Xbox Controller:"),
+        ("playstation", "PlayStation Controller:"),
+    )
+    
+    # Configurable buttons: (controller type, button name, label, default button)
+    BUTTON_MAPPINGS = (
+        ("xbox", "select", "A (Select):", 0),
+        ("xbox", "back", "B (Back):", 1),
+        ("xbox", "guide", "Guide Button:", 8),
+        ("playstation", "select", "X (Select):", 0),
+        ("playstation", "back", "Circle (Back):", 1),
+        ("playstation", "guide", "PS Button:", 10),
+    )
+    
     def __init__(self, config_manager):
         """Initialize the preferences window.
         
@@ -25,6 +75,37 @@ class PreferencesWindow(Gtk.Window):
         super().__init__(title="ControllerLaunch Preferences")
         self.config = config_manager
         
+        # Source IDs of pending debounced refreshes (0 if none)
+        self._pending_detect_id = 0
+        self._pending_status_id = 0
+        
+        # Source ID of the timeout filling the controller list (0 if none)
+        self._controller_fill_id = 0
+        
+        # Source ID of a pending Apply (0 if none)
+        self._pending_save_id = 0
+        
+        # Cancelled on close so late systemctl results are dropped
+        self._cancellable = Gio.Cancellable()
+        
+        # Last systemctl is-active output and when it was read; only used
+        # while the unit proxy below is not connected
+        self._status_cache = None
+        self._status_cache_time = 0.0
+        
+        # D-Bus proxy for the service's systemd unit, once connected
+        self._unit_proxy = None
+        self._unit_handler_id = 0
+        
+        # Button mapping spin buttons, keyed by (controller type, button name)
+        self._button_spins = {}
+        
+        # Folder choosers for the path lists, created on first Browse
+        self._file_choosers = {}
+        
+        # Parent folder of the last folder picked with Browse
+        self._last_browse_dir = None
+        
         # Setup window
         self.set_default_size(700, 500)
         self.set_position(Gtk.WindowPosition.CENTER)
@@ -36,8 +117,8 @@ class PreferencesWindow(Gtk.Window):
         # Create UI
         self._create_ui()
         
-        # Load initial values
-        self._load_config()
+        # Build and load the tab shown on open; the others follow on first view
+        self._build_tab(self.notebook.get_current_page())
     
     def _create_ui(self):
         """Create UI elements."""
@@ -45,25 +126,24 @@ class PreferencesWindow(Gtk.Window):
         main_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
         self.add(main_box)
         
-        # Create notebook (tabbed interface)
-        notebook = Gtk.Notebook()
-        main_box.pack_start(notebook, True, True, 0)
-        
-        # General tab
-        general_page = self._create_general_tab()
-        notebook.append_page(general_page, Gtk.Label(label="General"))
-        
-        # Controller tab
-        controller_page = self._create_controller_tab()
-        notebook.append_page(controller_page, Gtk.Label(label="Controllers"))
-        
-        # Games tab
-        games_page = self._create_games_tab()
-        notebook.append_page(games_page, Gtk.Label(label="Games"))
-        
-        # About tab
-        about_page = self._create_about_tab()
-        notebook.append_page(about_page, Gtk.Label(label="About"))
+        # Create notebook (tabbed interface). Each tab starts as an empty
+        # placeholder and is built the first time it is shown.
+        self.notebook = Gtk.Notebook()
+        main_box.pack_start(self.notebook, True, True, 0)
+        
+        # Page number -> (build, load config, save config) for each tab
+        self._tab_builders = {}
+        self._tabs_built = set()
+        tabs = (
+            ("General", self._create_general_tab, self._load_general_config, self._save_general_config),
+            ("Controllers", self._create_controller_tab, self._load_controller_config, self._save_controller_config),
+            ("Games", self._create_games_tab, self._load_games_config, self._save_games_config),
+            ("About", self._create_about_tab, None, None),
+        )
+        for title, create_tab, load_tab, save_tab in tabs:
+            page_num = self.notebook.append_page(Gtk.Box(), Gtk.Label(label=title))
+            self._tab_builders[page_num] = (create_tab, load_tab, save_tab)
+        self.notebook.connect("switch-page", self._on_switch_page)
         
         # Action buttons
         button_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
@@ -81,6 +161,28 @@ class PreferencesWindow(Gtk.Window):
         
         main_box.pack_end(button_box, False, False, 0)
     
+    def _on_switch_page(self, notebook, page, page_num):
+        """Build a tab the first time it is shown."""
+        self._build_tab(page_num)
+    
+    def _build_tab(self, page_num):
+        """Build a tab's widgets into its placeholder and load its settings.
+        
+        Args:
+            page_num: Notebook page number of the tab
+        """
+        if page_num in self._tabs_built or page_num not in self._tab_builders:
+            return
+        self._tabs_built.add(page_num)
+        
+        create_tab, load_tab, _ = self._tab_builders[page_num]
+        content = create_tab()
+        self.notebook.get_nth_page(page_num).pack_start(content, True, True, 0)
+        content.show_all()
+        
+        if load_tab:
+            load_tab(self.config.get_all())
+    
     def _create_general_tab(self):
         """Create general settings tab.
         
@@ -217,7 +319,7 @@ class PreferencesWindow(Gtk.Window):
         scrolled.set_policy(Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.AUTOMATIC)
         scrolled.set_size_request(-1, 150)
         
-        self.controller_store = Gtk.ListStore(str, str, int, int)  # id, name, buttons, axes
+        self.controller_store = Gtk.ListStore(int, str, int, int)  # id, name, buttons, axes
         controller_view = Gtk.TreeView(model=self.controller_store)
         
         # Columns
@@ -250,37 +352,21 @@ class PreferencesWindow(Gtk.Window):
         mapping_label.set_line_wrap(True)
         mapping_box.pack_start(mapping_label, False, False, 0)
         
-        # Xbox mapping
-        xbox_label = Gtk.Label(label="Xbox Controller:")
-        xbox_label.set_halign(Gtk.Align.START)
-        mapping_box.pack_start(xbox_label, False, False, 0)
-        
-        xbox_grid = Gtk.Grid()
-        xbox_grid.set_column_spacing(10)
-        xbox_grid.set_row_spacing(5)
-        
-        # Xbox button rows
-        self._create_button_mapping_row(xbox_grid, 0, "A (Select):", "xbox", "select")
-        self._create_button_mapping_row(xbox_grid, 1, "B (Back):", "xbox", "back")
-        self._create_button_mapping_row(xbox_grid, 2, "Guide Button:", "xbox", "guide")
-        
-        mapping_box.pack_start(xbox_grid, False, False, 10)
-        
-        # PS5 mapping
-        ps_label = Gtk.Label(label="PlayStation Controller:")
-        ps_label.set_halign(Gtk.Align.START)
-        mapping_box.pack_start(ps_label, False, False, 0)
-        
-        ps_grid = Gtk.Grid()
-        ps_grid.set_column_spacing(10)
-        ps_grid.set_row_spacing(5)
-        
-        # PS button rows
-        self._create_button_mapping_row(ps_grid, 0, "X (Select):", "playstation", "select")
-        self._create_button_mapping_row(ps_grid, 1, "Circle (Back):", "playstation", "back")
-        self._create_button_mapping_row(ps_grid, 2, "PS Button:", "playstation", "guide")
-        
-        mapping_box.pack_start(ps_grid, False, False, 10)
+        # One heading and grid of button rows per controller type
+        for controller_type, heading in self.CONTROLLER_TYPES:
+            type_label = Gtk.Label(label=heading)
+            type_label.set_halign(Gtk.Align.START)
+            mapping_box.pack_start(type_label, False, False, 0)
+            
+            grid = Gtk.Grid()
+            grid.set_column_spacing(10)
+            grid.set_row_spacing(5)
+            
+            rows = [m for m in self.BUTTON_MAPPINGS if m[0] == controller_type]
+            for row, (_, button_name, label_text, _) in enumerate(rows):
+                self._create_button_mapping_row(grid, row, label_text, controller_type, button_name)
+                
+            mapping_box.pack_start(grid, False, False, 10)
         
         # Button mapping instructions
         help_label = Gtk.Label()
@@ -306,15 +392,13 @@ class PreferencesWindow(Gtk.Window):
             controller_type: Controller type (xbox, playstation)
             button_name: Button name in config
         """
-        label = Gtk.Label(label=label_text)
-        label.set_halign(Gtk.Align.START)
+        label = Gtk.Label(label=label_text, halign=Gtk.Align.START)
         
         spinner = Gtk.SpinButton.new_with_range(0, 30, 1)
         spinner.set_numeric(True)
         
         # Store reference to retrieve values later
-        attr_name = f"{controller_type}_{button_name}_spin"
-        setattr(self, attr_name, spinner)
+        self._button_spins[(controller_type, button_name)] = spinner
         
         grid.attach(label, 0, row, 1, 1)
         grid.attach(spinner, 1, row, 1, 1)
@@ -334,53 +418,20 @@ class PreferencesWindow(Gtk.Window):
         paths_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
         paths_box.set_border_width(10)
         
-        # Steam paths
-        steam_label = Gtk.Label(label="Steam Paths:")
-        steam_label.set_halign(Gtk.Align.START)
-        paths_box.pack_start(steam_label, False, False, 0)
-        
-        self.steam_paths_store = Gtk.ListStore(str)
-        self.steam_paths_view = self._create_path_list_view(self.steam_paths_store)
-        paths_box.pack_start(self.steam_paths_view, True, True, 0)
-        
-        steam_buttons = self._create_path_buttons(self.steam_paths_store)
-        paths_box.pack_start(steam_buttons, False, False, 0)
-        
-        # Flatpak paths
-        flatpak_label = Gtk.Label(label="Flatpak Paths:")
-        flatpak_label.set_halign(Gtk.Align.START)
-        paths_box.pack_start(flatpak_label, False, False, 10)
-        
-        self.flatpak_paths_store = Gtk.ListStore(str)
-        self.flatpak_paths_view = self._create_path_list_view(self.flatpak_paths_store)
-        paths_box.pack_start(self.flatpak_paths_view, True, True, 0)
-        
-        flatpak_buttons = self._create_path_buttons(self.flatpak_paths_store)
-        paths_box.pack_start(flatpak_buttons, False, False, 0)
-        
-        # Lutris paths
-        lutris_label = Gtk.Label(label="Lutris Paths:")
-        lutris_label.set_halign(Gtk.Align.START)
-        paths_box.pack_start(lutris_label, False, False, 10)
-        
-        self.lutris_paths_store = Gtk.ListStore(str)
-        self.lutris_paths_view = self._create_path_list_view(self.lutris_paths_store)
-        paths_box.pack_start(self.lutris_paths_view, True, True, 0)
-        
-        lutris_buttons = self._create_path_buttons(self.lutris_paths_store)
-        paths_box.pack_start(lutris_buttons, False, False, 0)
-        
-        # Custom paths
-        custom_label = Gtk.Label(label="Custom Game Paths:")
-        custom_label.set_halign(Gtk.Align.START)
-        paths_box.pack_start(custom_label, False, False, 10)
-        
-        self.custom_paths_store = Gtk.ListStore(str)
-        self.custom_paths_view = self._create_path_list_view(self.custom_paths_store)
-        paths_box.pack_start(self.custom_paths_view, True, True, 0)
-        
-        custom_buttons = self._create_path_buttons(self.custom_paths_store)
-        paths_box.pack_start(custom_buttons, False, False, 0)
+        # One editable list with Add/Remove/Browse buttons per source
+        self.path_stores = {}
+        for i, (source, label_text, _) in enumerate(self.PATH_LISTS):
+            label = Gtk.Label(label=label_text)
+            label.set_halign(Gtk.Align.START)
+            paths_box.pack_start(label, False, False, 10 if i else 0)
+            
+            store = Gtk.ListStore(str)
+            scrolled, view = self._create_path_list_view(store)
+            paths_box.pack_start(scrolled, True, True, 0)
+            
+            buttons = self._create_path_buttons(store, view)
+            paths_box.pack_start(buttons, False, False, 0)
+            self.path_stores[source] = store
         
         paths_frame.add(paths_box)
         page.pack_start(paths_frame, True, True, 0)
@@ -418,13 +469,14 @@ class PreferencesWindow(Gtk.Window):
             store: ListStore to use
             
         Returns:
-            Gtk.ScrolledWindow containing the list view
+            Tuple of the Gtk.ScrolledWindow to pack and the Gtk.TreeView in it
         """
         scrolled = Gtk.ScrolledWindow()
         scrolled.set_policy(Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.AUTOMATIC)
         scrolled.set_size_request(-1, 80)
         
         view = Gtk.TreeView(model=store)
+        view.get_selection().set_mode(Gtk.SelectionMode.MULTIPLE)
         renderer = Gtk.CellRendererText()
         renderer.set_property("editable", True)
         renderer.connect("edited", self.on_path_edited, store)
@@ -434,13 +486,14 @@ class PreferencesWindow(Gtk.Window):
         view.append_column(column)
         
         scrolled.add(view)
-        return scrolled
+        return scrolled, view
     
-    def _create_path_buttons(self, store):
+    def _create_path_buttons(self, store, view):
         """Create buttons for managing paths.
         
         Args:
             store: ListStore to manage
+            view: TreeView showing the store
             
         Returns:
             Gtk.Box containing the buttons
@@ -452,11 +505,11 @@ class PreferencesWindow(Gtk.Window):
         box.pack_start(add_button, False, False, 0)
         
         remove_button = Gtk.Button.new_with_label("Remove")
-        remove_button.connect("clicked", self.on_remove_path, store)
+        remove_button.connect("clicked", self.on_remove_path, store, view)
         box.pack_start(remove_button, False, False, 0)
         
         browse_button = Gtk.Button.new_with_label("Browse...")
-        browse_button.connect("clicked", self.on_browse_path, store)
+        browse_button.connect("clicked", self.on_browse_path, store, view)
         box.pack_start(browse_button, False, False, 0)
         
         return box
@@ -496,186 +549,453 @@ class PreferencesWindow(Gtk.Window):
         
         return page
     
-    def _load_config(self):
-        """Load configuration into UI elements."""
+    def _load_general_config(self, config):
+        """Load configuration into the General tab.
+        
+        Args:
+            config: Configuration dict from ConfigManager.get_all()
+        """
         # General settings
-        self.autostart_switch.set_active(self.config.get("general", "autostart", True))
-        self.minimize_switch.set_active(self.config.get("general", "minimize_to_tray", True))
+        general = config.get("general", {})
+        self.autostart_switch.set_active(general.get("autostart", True))
+        self.minimize_switch.set_active(general.get("minimize_to_tray", True))
         
         # UI settings
-        self.opacity_scale.set_value(self.config.get("ui", "opacity", 0.9))
-        self.show_art_switch.set_active(self.config.get("ui", "show_game_art", True))
+        ui = config.get("ui", {})
+        self.opacity_scale.set_value(ui.get("opacity", 0.9))
+        self.show_art_switch.set_active(ui.get("show_game_art", True))
         
+        # Follow the daemon state over D-Bus, falling back to systemctl
+        # until the unit proxy is ready
+        self._watch_daemon_status()
+        self._update_daemon_status()
+    
+    def _load_controller_config(self, config):
+        """Load configuration into the Controllers tab.
+        
+        Args:
+            config: Configuration dict from ConfigManager.get_all()
+        """
         # Controller settings
-        self.duration_spin.set_value(self.config.get("controller", "long_press_duration", 1.0))
+        controller = config.get("controller", {})
+        self.duration_spin.set_value(controller.get("long_press_duration", 1.0))
         
         # Load button mappings
-        button_mapping = self.config.get("controller", "button_mapping", {})
-        xbox_mapping = button_mapping.get("xbox", {})
-        ps_mapping = button_mapping.get("playstation", {})
-        
-        # Set Xbox button mappings
-        if hasattr(self, "xbox_select_spin"):
-            self.xbox_select_spin.set_value(int(xbox_mapping.get("select", 0)))
-        if hasattr(self, "xbox_back_spin"):
-            self.xbox_back_spin.set_value(int(xbox_mapping.get("back", 1)))
-        if hasattr(self, "xbox_guide_spin"):
-            self.xbox_guide_spin.set_value(int(xbox_mapping.get("guide", 8)))
-        
-        # Set PlayStation button mappings
-        if hasattr(self, "playstation_select_spin"):
-            self.playstation_select_spin.set_value(int(ps_mapping.get("select", 0)))
-        if hasattr(self, "playstation_back_spin"):
-            self.playstation_back_spin.set_value(int(ps_mapping.get("back", 1)))
-        if hasattr(self, "playstation_guide_spin"):
-            self.playstation_guide_spin.set_value(int(ps_mapping.get("guide", 10)))
-        
-        # Load game paths
-        game_paths = self.config.get("games", "paths", {})
+        button_mapping = controller.get("button_mapping", {})
+        for controller_type, button_name, _, default in self.BUTTON_MAPPINGS:
+            spinner = self._button_spins[(controller_type, button_name)]
+            spinner.set_value(int(button_mapping.get(controller_type, {}).get(button_name, default)))
         
-        # Steam paths
-        self.steam_paths_store.clear()
-        for path in game_paths.get("steam", ["~/.steam", "~/.local/share/Steam"]):
-            self.steam_paths_store.append([path])
-        
-        # Flatpak paths
-        self.flatpak_paths_store.clear()
-        for path in game_paths.get("flatpak", ["/var/lib/flatpak/app"]):
-            self.flatpak_paths_store.append([path])
+        # Update controller list, reusing a recent scan when there is one
+        self._update_controller_list(rescan=False)
+    
+    def _load_games_config(self, config):
+        """Load configuration into the Games tab.
         
-        # Lutris paths
-        self.lutris_paths_store.clear()
-        for path in game_paths.get("lutris", ["~/.local/share/lutris"]):
-            self.lutris_paths_store.append([path])
+        Args:
+            config: Configuration dict from ConfigManager.get_all()
+        """
+        # Load game paths
+        games = config.get("games", {})
+        game_paths = games.get("paths", {})
         
-        # Custom paths
-        self.custom_paths_store.clear()
-        for path in game_paths.get("custom", []):
-            self.custom_paths_store.append([path])
+        for source, _, default_paths in self.PATH_LISTS:
+            self._fill_path_store(self.path_stores[source], game_paths.get(source, default_paths))
         
         # Max games
-        self.max_games_spin.set_value(self.config.get("games", "max_games_shown", 10))
+        self.max_games_spin.set_value(games.get("max_games_shown", 10))
+    
+    def _fill_path_store(self, store, paths):
+        """Replace the contents of a path list.
         
-        # Update controller list
-        self._update_controller_list()
+        Args:
+            store: ListStore to fill
+            paths: Paths to show
+        """
+        store.clear()
+        for path in paths:
+            store.insert_with_valuesv(-1, [0], [path])
+    
+    def _normalize_path(self, path):
+        """Get a comparable form of a configured path.
         
-        # Update daemon status
-        self._update_daemon_status()
+        Args:
+            path: Path as stored or chosen, possibly starting with "~"
+            
+        Returns:
+            Normalized path with "~" expanded
+        """
+        return os.path.normpath(os.path.expanduser(path))
+    
+    def _collect_paths(self, store):
+        """Get the paths in a path list.
+        
+        Args:
+            store: ListStore to read
+            
+        Returns:
+            List of paths, in display order
+        """
+        paths = []
+        store.foreach(lambda model, path, treeiter, out: out.append(model.get_value(treeiter, 0)), paths)
+        return paths
     
-    def _update_controller_list(self):
-        """Update the list of connected controllers."""
+    def _update_controller_list(self, rescan=True):
+        """Update the list of connected controllers.
+        
+        Args:
+            rescan: Detect controllers even if a recent result is cached
+        """
         self.controller_store.clear()
+        if self._controller_fill_id:
+            GLib.source_remove(self._controller_fill_id)
+            self._controller_fill_id = 0
+        
+        cls = type(self)
+        age = time.monotonic() - cls._detected_controllers_time
+        if rescan or cls._detected_controllers is None or age >= self.CONTROLLER_CACHE_TTL:
+            cls._detected_controllers = ControllerDaemon.detect_controllers()
+            cls._detected_controllers_time = time.monotonic()
+        
+        # Add the rows in small batches so a long list does not hold up
+        # drawing; the first batch goes in right away
+        controllers = iter(cls._detected_controllers)
+        if self._append_controllers(controllers):
+            self._controller_fill_id = GLib.timeout_add(16, self._append_controllers, controllers)
+    
+    def _append_controllers(self, controllers):
+        """Add the next batch of detected controllers to the list.
         
-        controllers = ControllerDaemon.detect_controllers()
-        for controller in controllers:
-            self.controller_store.append([
-                str(controller['id']),
+        Args:
+            controllers: Iterator over the remaining controller dicts
+            
+        Returns:
+            True if more controllers remain, so the timeout keeps running
+        """
+        batch = list(itertools.islice(controllers, self.CONTROLLER_BATCH_SIZE))
+        for controller in batch:
+            self.controller_store.insert_with_valuesv(-1, [0, 1, 2, 3], [
+                controller['id'],
                 controller['name'],
                 controller['buttons'],
                 controller['axes']
             ])
+            
+        if len(batch) < self.CONTROLLER_BATCH_SIZE:
+            self._controller_fill_id = 0
+            return False
+        return True
+    
+    def _debounce(self, pending_id, callback):
+        """Schedule a callback, replacing a pending one that has not run yet.
+        
+        Args:
+            pending_id: Source ID of the pending call, or 0 if none
+            callback: Function to run once the delay has passed
+            
+        Returns:
+            Source ID of the scheduled call
+        """
+        if pending_id:
+            GLib.source_remove(pending_id)
+        return GLib.timeout_add(self.REFRESH_DELAY, callback)
     
     def _update_daemon_status(self):
+        """Schedule an update of the daemon status display.
+        
+        Repeated requests within REFRESH_DELAY run systemctl only once.
+        """
+        self._pending_status_id = self._debounce(self._pending_status_id, self._do_update_daemon_status)
+    
+    def _do_update_daemon_status(self):
         """Update the daemon status display."""
+        self._pending_status_id = 0
+        
+        # systemd already pushes state changes to the unit proxy
+        if self._unit_proxy is not None:
+            self._apply_unit_state()
+            return False
+            
+        # The daemon state rarely changes between clicks; reuse a recent answer
+        if self._status_cache is not None and time.monotonic() - self._status_cache_time < self.STATUS_CACHE_TTL:
+            self._apply_daemon_status(self._status_cache)
+            return False
+            
         try:
             # Check if daemon is running
-            result = subprocess.run(
-                ["systemctl", "--user", "is-active", "controller-launch.service"],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
-            
-            if result.stdout.strip() == "active":
-                self.daemon_status_label.set_markup("<b>Daemon status:</b> Running")
-                self.daemon_button.set_label("Stop Daemon")
-                self.service_button.set_label("Uninstall Service")
-            else:
-                self.daemon_status_label.set_markup("<b>Daemon status:</b> Stopped")
-                self.daemon_button.set_label("Start Daemon")
-                self.service_button.set_label("Install Service")
-        except Exception:
-            self.daemon_status_label.set_markup("<b>Daemon status:</b> Unknown")
+            self._run_systemctl(["is-active", "controller-launch.service"], self._on_daemon_status)
+        except GLib.Error as e:
+            logger.error(f"Error checking daemon status: {str(e)}")
+            self._apply_daemon_status(None)
+        return False
     
-    def _save_config(self):
-        """Save configuration from UI elements."""
-        # General settings
-        self.config.set("general", "autostart", self.autostart_switch.get_active())
-        self.config.set("general", "minimize_to_tray", self.minimize_switch.get_active())
+    def _on_daemon_status(self, output):
+        """Cache and show the result of systemctl is-active.
         
-        # UI settings
-        self.config.set("ui", "opacity", self.opacity_scale.get_value())
-        self.config.set("ui", "show_game_art", self.show_art_switch.get_active())
+        Args:
+            output: Output of the command, or None if it failed
+        """
+        # The unit proxy connected while systemctl was running
+        if self._unit_proxy is not None:
+            return
+            
+        if output is not None:
+            self._status_cache = output
+            self._status_cache_time = time.monotonic()
+        self._apply_daemon_status(output)
+    
+    def _refresh_daemon_status(self):
+        """Re-read the daemon status after the daemon was changed.
         
-        # Controller settings
-        self.config.set("controller", "long_press_duration", self.duration_spin.get_value())
+        Once the unit proxy is connected systemd pushes the new state, so
+        only the systemctl fallback has a cache to forget.
+        """
+        if self._unit_proxy is None:
+            self._status_cache = None
+            self._update_daemon_status()
+    
+    def _watch_daemon_status(self):
+        """Start following the service's ActiveState through systemd's D-Bus API."""
+        Gio.DBusProxy.new_for_bus(
+            Gio.BusType.SESSION,
+            Gio.DBusProxyFlags.DO_NOT_LOAD_PROPERTIES,
+            None,
+            "org.freedesktop.systemd1",
+            "/org/freedesktop/systemd1",
+            "org.freedesktop.systemd1.Manager",
+            self._cancellable,
+            self._on_manager_proxy_ready,
+            None
+        )
+    
+    def _on_manager_proxy_ready(self, source, result, user_data):
+        """Subscribe to systemd signals and look up the service's unit."""
+        try:
+            manager = Gio.DBusProxy.new_for_bus_finish(result)
+        except GLib.Error as e:
+            self._log_dbus_error(e)
+            return
+            
+        # systemd only emits PropertiesChanged once a client has subscribed
+        manager.call("Subscribe", None, Gio.DBusCallFlags.NONE, -1, self._cancellable, None, None)
+        manager.call(
+            "LoadUnit",
+            GLib.Variant("(s)", ("controller-launch.service",)),
+            Gio.DBusCallFlags.NONE,
+            -1,
+            self._cancellable,
+            self._on_unit_loaded,
+            None
+        )
+    
+    def _on_unit_loaded(self, manager, result, user_data):
+        """Create a proxy for the service's unit object."""
+        try:
+            unit_path = manager.call_finish(result).unpack()[0]
+        except GLib.Error as e:
+            self._log_dbus_error(e)
+            return
+            
+        Gio.DBusProxy.new_for_bus(
+            Gio.BusType.SESSION,
+            Gio.DBusProxyFlags.NONE,
+            None,
+            "org.freedesktop.systemd1",
+            unit_path,
+            "org.freedesktop.systemd1.Unit",
+            self._cancellable,
+            self._on_unit_proxy_ready,
+            None
+        )
+    
+    def _on_unit_proxy_ready(self, source, result, user_data):
+        """Show the unit's state and follow its changes."""
+        try:
+            self._unit_proxy = Gio.DBusProxy.new_for_bus_finish(result)
+        except GLib.Error as e:
+            self._log_dbus_error(e)
+            return
+            
+        self._unit_handler_id = self._unit_proxy.connect("g-properties-changed", self._on_unit_properties_changed)
+        self._status_cache = None
+        self._apply_unit_state()
+    
+    def _on_unit_properties_changed(self, proxy, changed, invalidated):
+        """Update the daemon status when the unit's ActiveState changes."""
+        if "ActiveState" in changed.keys() or "ActiveState" in invalidated:
+            self._apply_unit_state()
+    
+    def _apply_unit_state(self):
+        """Show the ActiveState cached by the unit proxy."""
+        state = self._unit_proxy.get_cached_property("ActiveState")
+        self._apply_daemon_status(state.unpack() if state is not None else None)
+    
+    def _log_dbus_error(self, error):
+        """Log a failed systemd D-Bus call, ignoring cancellation on close."""
+        if not error.matches(Gio.io_error_quark(), Gio.IOErrorEnum.CANCELLED):
+            logger.warning(f"Cannot follow daemon status over D-Bus: {str(error)}")
+    
+    def _apply_daemon_status(self, output):
+        """Show the result of systemctl is-active.
         
-        # Button mappings
-        button_mapping = self.config.get("controller", "button_mapping", {})
+        Args:
+            output: Output of the command, or None if it failed
+        """
+        if output is None:
+            self._set_status_markup("<b>Daemon status:</b> Unknown")
+        elif output.strip() == "active":
+            self._set_status_markup("<b>Daemon status:</b> Running")
+            self.daemon_button.set_label("Stop Daemon")
+            self.service_button.set_label("Uninstall Service")
+        else:
+            self._set_status_markup("<b>Daemon status:</b> Stopped")
+            self.daemon_button.set_label("Start Daemon")
+            self.service_button.set_label("Install Service")
+    
+    def _set_status_markup(self, markup):
+        """Show markup in the daemon status label, parsing it only once.
         
-        # Xbox mappings
-        xbox_mapping = {}
-        if hasattr(self, "xbox_select_spin"):
-            xbox_mapping["select"] = int(self.xbox_select_spin.get_value())
-        if hasattr(self, "xbox_back_spin"):
-            xbox_mapping["back"] = int(self.xbox_back_spin.get_value())
-        if hasattr(self, "xbox_guide_spin"):
-            xbox_mapping["guide"] = int(self.xbox_guide_spin.get_value())
+        Args:
+            markup: Pango markup for the label
+        """
+        attrs, text = _parse_markup(markup)
+        self.daemon_status_label.set_text(text)
+        self.daemon_status_label.set_attributes(attrs)
+    
+    def _run_systemctl(self, args, callback):
+        """Run a systemctl --user command without blocking the main loop.
         
-        button_mapping["xbox"] = xbox_mapping
+        Args:
+            args: Arguments passed after systemctl --user
+            callback: Called on the main loop with the command's output, or
+                None if it could not be read
+                
+        Raises:
+            GLib.Error: If systemctl could not be started
+        """
+        proc = Gio.Subprocess.new(
+            ["systemctl", "--user"] + args,
+            Gio.SubprocessFlags.STDOUT_PIPE | Gio.SubprocessFlags.STDERR_SILENCE
+        )
+        proc.communicate_utf8_async(None, self._cancellable, self._on_systemctl_done, callback)
+    
+    def _on_systemctl_done(self, proc, result, callback):
+        """Finish an asynchronous systemctl call and pass on its output."""
+        try:
+            _, output, _ = proc.communicate_utf8_finish(result)
+        except GLib.Error as e:
+            if e.matches(Gio.io_error_quark(), Gio.IOErrorEnum.CANCELLED):
+                return
+            logger.error(f"Error reading systemctl output: {str(e)}")
+            output = None
+        callback(output)
+    
+    def _save_config(self):
+        """Save configuration from UI elements.
         
-        # PlayStation mappings
-        ps_mapping = {}
-        if hasattr(self, "playstation_select_spin"):
-            ps_mapping["select"] = int(self.playstation_select_spin.get_value())
-        if hasattr(self, "playstation_back_spin"):
-            ps_mapping["back"] = int(self.playstation_back_spin.get_value())
-        if hasattr(self, "playstation_guide_spin"):
-            ps_mapping["guide"] = int(self.playstation_guide_spin.get_value())
+        Tabs that were never opened still hold their stored values, so only
+        the built tabs are saved. All values are written in one update.
+        """
+        updates = {}
+        for page_num in sorted(self._tabs_built):
+            save_tab = self._tab_builders[page_num][2]
+            if save_tab:
+                for section, values in save_tab().items():
+                    updates.setdefault(section, {}).update(values)
+                    
+        if updates:
+            self.config.update(updates)
+    
+    def _save_general_config(self):
+        """Collect configuration from the General tab.
         
-        button_mapping["playstation"] = ps_mapping
+        Returns:
+            Dict mapping section names to changed settings
+        """
+        return {
+            # General settings
+            "general": {
+                "autostart": self.autostart_switch.get_active(),
+                "minimize_to_tray": self.minimize_switch.get_active()
+            },
+            # UI settings
+            "ui": {
+                "opacity": self.opacity_scale.get_value(),
+                "show_game_art": self.show_art_switch.get_active()
+            }
+        }
+    
+    def _save_controller_config(self):
+        """Collect configuration from the Controllers tab.
         
-        self.config.set("controller", "button_mapping", button_mapping)
+        Returns:
+            Dict mapping section names to changed settings
+        """
+        # Button mappings, keeping those of other controller types
+        button_mapping = dict(self.config.get("controller", "button_mapping", {}))
+        for controller_type, _ in self.CONTROLLER_TYPES:
+            button_mapping[controller_type] = {}
+        for (controller_type, button_name), spinner in self._button_spins.items():
+            button_mapping[controller_type][button_name] = int(spinner.get_value())
+        
+        return {
+            "controller": {
+                "long_press_duration": self.duration_spin.get_value(),
+                "button_mapping": button_mapping
+            }
+        }
+    
+    def _save_games_config(self):
+        """Collect configuration from the Games tab.
         
+        Returns:
+            Dict mapping section names to changed settings
+        """
         # Game paths
-        game_paths = {}
-        
-        # Steam paths
-        steam_paths = []
-        for row in self.steam_paths_store:
-            steam_paths.append(row[0])
-        game_paths["steam"] = steam_paths
-        
-        # Flatpak paths
-        flatpak_paths = []
-        for row in self.flatpak_paths_store:
-            flatpak_paths.append(row[0])
-        game_paths["flatpak"] = flatpak_paths
-        
-        # Lutris paths
-        lutris_paths = []
-        for row in self.lutris_paths_store:
-            lutris_paths.append(row[0])
-        game_paths["lutris"] = lutris_paths
-        
-        # Custom paths
-        custom_paths = []
-        for row in self.custom_paths_store:
-            custom_paths.append(row[0])
-        game_paths["custom"] = custom_paths
-        
-        self.config.set("games", "paths", game_paths)
-        
-        # Max games
-        self.config.set("games", "max_games_shown", self.max_games_spin.get_value_as_int())
+        game_paths = {
+            source: self._collect_paths(store)
+            for source, store in self.path_stores.items()
+        }
+        
+        return {
+            "games": {
+                "paths": game_paths,
+                "max_games_shown": self.max_games_spin.get_value_as_int()
+            }
+        }
     
     def on_save(self, widget):
-        """Handle save button click."""
+        """Handle save button click.
+        
+        The save runs from an idle callback, so repeated clicks handled in
+        the same main loop iteration result in a single save.
+        """
+        if not self._pending_save_id:
+            self._pending_save_id = GLib.idle_add(self._flush_save)
+    
+    def _flush_save(self):
+        """Run a pending Apply."""
+        self._pending_save_id = 0
         self._save_config()
         self._update_daemon_status()
+        return False
     
     def on_close(self, widget, event=None):
         """Handle close button click."""
+        # Don't lose an Apply that has not run yet
+        if self._pending_save_id:
+            GLib.source_remove(self._pending_save_id)
+            self._pending_save_id = 0
+            self._save_config()
+            
+        for source_id in (self._pending_detect_id, self._pending_status_id, self._controller_fill_id):
+            if source_id:
+                GLib.source_remove(source_id)
+        self._pending_detect_id = self._pending_status_id = self._controller_fill_id = 0
+        self._cancellable.cancel()
+        if self._unit_handler_id:
+            self._unit_proxy.disconnect(self._unit_handler_id)
+            self._unit_handler_id = 0
         self.destroy()
         return False
     
@@ -684,39 +1004,70 @@ class PreferencesWindow(Gtk.Window):
         try:
             if self.daemon_button.get_label() == "Start Daemon":
                 # Start daemon
-                subprocess.run(["systemctl", "--user", "start", "controller-launch.service"])
+                args = ["start", "controller-launch.service"]
             else:
                 # Stop daemon
-                subprocess.run(["systemctl", "--user", "stop", "controller-launch.service"])
+                args = ["stop", "controller-launch.service"]
             
-            # Update status
-            self._update_daemon_status()
-        except Exception as e:
+            # Update status once systemctl has finished
+            self._run_systemctl(args, self._on_daemon_toggled)
+        except GLib.Error as e:
             logger.error(f"Error toggling daemon: {str(e)}")
             self._show_error_dialog("Error", f"Failed to toggle daemon: {str(e)}")
     
+    def _on_daemon_toggled(self, output):
+        """Refresh the daemon status after a start or stop."""
+        self._refresh_daemon_status()
+    
     def on_service_toggle(self, widget):
         """Handle service installation toggle button click."""
+        if self.service_button.get_label() == "Install Service":
+            # Install service
+            toggle_service = ControllerDaemon.install_systemd_service
+        else:
+            # Uninstall service
+            toggle_service = ControllerDaemon.uninstall_systemd_service
+        
+        # The service helpers wait on several systemctl calls, so run them
+        # off the main loop
+        self.service_button.set_sensitive(False)
+        threading.Thread(target=self._toggle_service_thread, args=(toggle_service,), daemon=True).start()
+    
+    def _toggle_service_thread(self, toggle_service):
+        """Install or uninstall the service and report back on the main loop.
+        
+        Args:
+            toggle_service: ControllerDaemon install or uninstall helper
+        """
         try:
-            if self.service_button.get_label() == "Install Service":
-                # Install service
-                success, message = ControllerDaemon.install_systemd_service()
-            else:
-                # Uninstall service
-                success, message = ControllerDaemon.uninstall_systemd_service()
-            
-            if success:
-                # Update status
-                self._update_daemon_status()
-            else:
-                self._show_error_dialog("Error", message)
+            success, message = toggle_service()
         except Exception as e:
             logger.error(f"Error toggling service: {str(e)}")
-            self._show_error_dialog("Error", f"Failed to toggle service: {str(e)}")
+            success, message = False, f"Failed to toggle service: {str(e)}"
+        GLib.idle_add(self._on_service_toggled, success, message)
+    
+    def _on_service_toggled(self, success, message):
+        """Show the result of a service install or uninstall."""
+        if self._cancellable.is_cancelled():
+            return False
+            
+        self.service_button.set_sensitive(True)
+        if success:
+            # Update status
+            self._refresh_daemon_status()
+        else:
+            self._show_error_dialog("Error", message)
+        return False
     
     def on_detect_controllers(self, widget):
         """Handle detect controllers button click."""
+        self._pending_detect_id = self._debounce(self._pending_detect_id, self._do_detect_controllers)
+    
+    def _do_detect_controllers(self):
+        """Run a debounced controller detection."""
+        self._pending_detect_id = 0
         self._update_controller_list()
+        return False
     
     def on_path_edited(self, renderer, path, new_text, store):
         """Handle path editing.
@@ -736,58 +1087,97 @@ class PreferencesWindow(Gtk.Window):
             widget: Button that was clicked
             store: ListStore to add to
         """
-        store.append(["~/new/path"])
+        store.insert_with_valuesv(-1, [0], ["~/new/path"])
     
-    def on_remove_path(self, widget, store):
+    def on_remove_path(self, widget, store, view):
         """Handle remove path button click.
         
         Args:
             widget: Button that was clicked
             store: ListStore to remove from
+            view: TreeView showing the store
         """
         # Get the selection
-        treeview = widget.get_parent().get_parent().get_children()[0].get_child()
-        selection = treeview.get_selection()
-        model, treeiter = selection.get_selected()
+        selection = view.get_selection()
+        model, selected = selection.get_selected_rows()
         
-        if treeiter is not None:
-            store.remove(treeiter)
+        # Rows come back in order; removing from the bottom up keeps the
+        # remaining paths valid
+        for path in reversed(selected):
+            store.remove(store.get_iter(path))
     
-    def on_browse_path(self, widget, store):
+    def on_browse_path(self, widget, store, view):
         """Handle browse path button click.
         
         Args:
             widget: Button that was clicked
             store: ListStore to update
+            view: TreeView showing the store
         """
-        dialog = Gtk.FileChooserDialog(
-            title="Select Folder",
-            parent=self,
-            action=Gtk.FileChooserAction.SELECT_FOLDER,
-        )
-        dialog.add_buttons(
-            Gtk.STOCK_CANCEL, Gtk.ResponseType.CANCEL, 
-            Gtk.STOCK_OPEN, Gtk.ResponseType.OK
-        )
+        # Use the native (portal) chooser and keep it for the next Browse
+        dialog = self._file_choosers.get(store)
+        if dialog is None:
+            dialog = Gtk.FileChooserNative.new(
+                "Select Folder",
+                self,
+                Gtk.FileChooserAction.SELECT_FOLDER,
+                "_Open",
+                "_Cancel"
+            )
+            dialog.set_select_multiple(True)
+            # Keep GVfs from mounting remote locations while browsing
+            dialog.set_local_only(True)
+            dialog.connect("response", self._on_browse_response, store, view)
+            self._file_choosers[store] = dialog
+        
+        # Start next to the last pick instead of enumerating Recent
+        dialog.set_current_folder(self._last_browse_dir or GLib.get_home_dir())
+        
+        # Return to the main loop; the choice arrives through "response"
+        dialog.show()
+    
+    def _on_browse_response(self, dialog, response, store, view):
+        """Handle the folders chosen in a Browse dialog.
+        
+        The first folder replaces the selected path, if any; the others are
+        added to the end of the list. Folders already in the list are skipped.
         
-        response = dialog.run()
-        if response == Gtk.ResponseType.OK:
-            folder_path = dialog.get_filename()
-            # Get the selection
-            treeview = widget.get_parent().get_parent().get_children()[0].get_child()
-            selection = treeview.get_selection()
-            model, treeiter = selection.get_selected()
+        Args:
+            dialog: FileChooserNative that was answered
+            response: Gtk.ResponseType of the answer
+            store: ListStore to update
+            view: TreeView showing the store
+        """
+        if response != Gtk.ResponseType.ACCEPT:
+            return
             
-            if treeiter is not None:
-                store[treeiter][0] = folder_path
-            else:
-                store.append([folder_path])
+        chosen = dialog.get_filenames()
+        if chosen:
+            self._last_browse_dir = GLib.path_get_dirname(chosen[0])
+            
+        # Look paths up in a set so picking many folders stays linear. Stored
+        # paths may be written with "~", so compare normalized absolute paths.
+        seen = {self._normalize_path(p) for p in self._collect_paths(store)}
+        folder_paths = []
+        for folder_path in chosen:
+            normalized = self._normalize_path(folder_path)
+            if normalized not in seen:
+                seen.add(normalized)
+                folder_paths.append(folder_path)
         
-        dialog.destroy()
+        # Get the selection
+        selection = view.get_selection()
+        model, selected = selection.get_selected_rows()
+        treeiter = store.get_iter(selected[0]) if selected else None
+        
+        if treeiter is not None and folder_paths:
+            store[treeiter][0] = folder_paths.pop(0)
+        for folder_path in folder_paths:
+            store.insert_with_valuesv(-1, [0], [folder_path])
     
     def on_clear_recent(self, widget):
         """Handle clear recent games button click."""
-        self.config.set("games", "recently_launched", [])
+        self.config.clear_recently_launched()
     
     def _show_error_dialog(self, title, message):
         """Show error dialog.
@@ -804,12 +1194,14 @@ class PreferencesWindow(Gtk.Window):
             text=title
         )
         dialog.format_secondary_text(message)
-        dialog.run()
-        dialog.destroy()
+        dialog.set_modal(True)
+        
+        # Show without a nested main loop; the dialog closes itself
+        dialog.connect("response", lambda dialog, response: dialog.destroy())
+        dialog.show()
 
 # For direct testing
 if __name__ == "__main__":
-    import sys
     from config_manager import ConfigManager
     
     logging.basicConfig(level=logging.INFO)